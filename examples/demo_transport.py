@@ -3,25 +3,26 @@
 交通手段別調整のデモンストレーション
 
 各交通手段でどのような持ち物が追加されるかを確認するスクリプト。
+リポジトリのルートで `uv run python -m examples.demo_transport` として実行する。
 """
 
-import sys
-
-sys.path.insert(0, ".")
+from collections import defaultdict
 
 from src.core.transport_rules import TransportRulesLoader
 
+# 追加条件として扱うパラメータのキー
+_CONDITION_KEYS = ("is_shinkansen", "is_rental", "is_highway", "night_bus")
+_SENTINEL = object()
+
 
 def extract_additional_conditions(params: dict[str, any]) -> dict[str, any]:
     """パラメータから追加条件を抽出する."""
     additional_conditions = {}
 
-    # 条件のキーリスト
-    condition_keys = ["is_shinkansen", "is_rental", "is_highway", "night_bus"]
-
-    for key in condition_keys:
-        if key in params:
-            additional_conditions[key] = params.pop(key)
+    for key in _CONDITION_KEYS:
+        value = params.pop(key, _SENTINEL)
+        if value is not _SENTINEL:
+            additional_conditions[key] = value
 
     # 距離の推定
     if params["duration"] >= 2:
@@ -51,10 +52,8 @@ def print_trip_details(
     print(f"\n📋 追加される持ち物 ({len(items)}個):")
 
     # カテゴリ別に整理
-    categories = {}
+    categories = defaultdict(list)
     for item in items:
-        if item.category not in categories:
-            categories[item.category] = []
         categories[item.category].append(item)
 
     for category, category_items in categories.items():
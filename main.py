@@ -3,28 +3,40 @@ TravelAssistant - AI-powered travel preparation assistant
 Main entry point for the Discord bot
 """
 
-import logging
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
 import os
 import sys
+from typing import TYPE_CHECKING
+
+from src.utils.logging_config import get_logger, setup_logging
+
+# discord.py / dotenv は読み込みが重いため、実際に必要になる関数内でimportする
+if TYPE_CHECKING:
+    from discord.ext import commands
+
+_REQUIRED_ENV_VARS = ("DISCORD_TOKEN", "GITHUB_TOKEN")
+
+# 起動後に環境変数が変わることはないため、一度だけ読み込んでキャッシュする
+_ENV_CACHE: dict[str, str | None] = {}
 
-import discord
-from discord.ext import commands
-from dotenv import load_dotenv
+logger = get_logger(__name__)
 
-# Load environment variables
-load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger(__name__)
+def load_environment() -> None:
+    """Load environment variables from .env and cache the required ones."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _ENV_CACHE.update({var: os.environ.get(var) for var in _REQUIRED_ENV_VARS})
 
 
 def check_environment() -> None:
     """Check required environment variables."""
-    required_vars = ["DISCORD_TOKEN", "GITHUB_TOKEN"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = [var for var, value in _ENV_CACHE.items() if not value]
 
     if missing_vars:
         logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
@@ -33,21 +45,28 @@ def check_environment() -> None:
 
     # Check if discord.py is available
     try:
+        import discord
+
         version = discord.__version__
         logger.info(f"Discord.py {version} imported successfully")
-    except AttributeError:
+    except (ImportError, AttributeError):
         logger.error("discord.py not found. Please install with: uv sync")
         sys.exit(1)
 
 
 def create_bot() -> commands.Bot:
     """Create and configure the Discord bot."""
+    import discord
+    from discord.ext import commands
+
     intents = discord.Intents.default()
     intents.message_content = True
 
     bot = commands.Bot(
         command_prefix="!", intents=intents, description="AI-powered Travel Assistant"
     )
+    # 最後に同期したコマンド定義のハッシュ（変更がない場合の無駄な同期を避ける）
+    last_cmd_hash: str | None = None
 
     @bot.event
     async def on_ready() -> None:
@@ -55,26 +74,19 @@ def create_bot() -> commands.Bot:
         logger.info(f"{bot.user} has connected to Discord!")
         logger.info(f"Bot is in {len(bot.guilds)} guilds")
 
-        # Load cogs
-        try:
-            await bot.load_extension("src.bot.commands")
-            logger.info("Loaded TripCommands cog")
-        except Exception as e:
-            logger.error(f"Failed to load cog: {e}")
-
-        # Load schedule commands cog
-        try:
-            await bot.load_extension("src.bot.schedule_commands")
-            logger.info("Loaded ScheduleCommands cog")
-        except Exception as e:
-            logger.error(f"Failed to load schedule commands cog: {e}")
-
-        # Sync slash commands
-        try:
-            synced = await bot.tree.sync()
-            logger.info(f"Synced {len(synced)} slash commands")
-        except Exception as e:
-            logger.error(f"Failed to sync commands: {e}")
+        # Load cogs concurrently
+        extensions = {
+            "src.bot.commands": "TripCommands",
+            "src.bot.schedule_commands": "ScheduleCommands",
+        }
+        results = await asyncio.gather(
+            *(bot.load_extension(name) for name in extensions), return_exceptions=True
+        )
+        for cog_name, result in zip(extensions.values(), results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to load {cog_name} cog: {result}")
+            else:
+                logger.info(f"Loaded {cog_name} cog")
 
     @bot.event
     async def on_command_error(
@@ -89,6 +101,38 @@ def create_bot() -> commands.Bot:
             logger.error(f"Error in command {ctx.command}: {error}")
             await ctx.send("エラーが発生しました。管理者に連絡してください。")
 
+    # Slash command sync (owner only)
+    # on_readyは再接続のたびに発火するため、同期はコマンド変更時に手動で実行する
+    @bot.command(name="sync")
+    @commands.is_owner()
+    async def sync_cmd(ctx: commands.Context[commands.Bot], guild_id: int | None = None) -> None:
+        """Sync slash commands globally, or to a single guild for development"""
+        nonlocal last_cmd_hash
+        try:
+            if guild_id is not None:
+                guild = discord.Object(id=guild_id)
+                bot.tree.copy_global_to(guild=guild)
+                synced = await bot.tree.sync(guild=guild)
+                logger.info(f"Synced {len(synced)} slash commands to guild {guild_id}")
+                await ctx.send(f"Synced {len(synced)} commands to guild {guild_id}")
+                return
+
+            payload = json.dumps(
+                [c.to_dict(bot.tree) for c in bot.tree.get_commands()], sort_keys=True
+            )
+            cmd_hash = hashlib.md5(payload.encode()).hexdigest()
+            if cmd_hash == last_cmd_hash:
+                await ctx.send("Slash commands unchanged, skipping sync")
+                return
+
+            synced = await bot.tree.sync()
+            last_cmd_hash = cmd_hash
+            logger.info(f"Synced {len(synced)} slash commands")
+            await ctx.send(f"Synced {len(synced)}")
+        except Exception as e:
+            logger.error(f"Failed to sync commands: {e}")
+            await ctx.send(f"Failed to sync commands: {e}")
+
     # Simple test command
     @bot.command(name="ping")
     async def ping(ctx: commands.Context[commands.Bot]) -> None:
@@ -100,12 +144,15 @@ def create_bot() -> commands.Bot:
 
 def run_bot(bot: commands.Bot) -> None:
     """Run the Discord bot."""
+    import discord
+
     try:
-        token = os.getenv("DISCORD_TOKEN")
+        token = _ENV_CACHE["DISCORD_TOKEN"]
         if not token:
             logger.error("DISCORD_TOKEN not found in environment variables")
             sys.exit(1)
-        bot.run(token)
+        # ログ設定はsetup_logging()で済ませているため、discord.py側のハンドラは追加しない
+        bot.run(token, log_handler=None)
     except discord.LoginFailure:
         logger.error("Invalid Discord token. Please check your .env file")
         sys.exit(1)
@@ -114,9 +161,28 @@ def run_bot(bot: commands.Bot) -> None:
         sys.exit(1)
 
 
+def install_event_loop_policy() -> None:
+    """Use uvloop for the event loop when it is installed (optional)."""
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        return
+
+    # bot.run()はasyncio.run()でループを作るため、その前にポリシーを差し替える
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info(f"Using uvloop {uvloop.__version__} event loop")
+
+
 def main() -> None:
     """Main function to run the bot"""
+    load_environment()
+    # 設定は.envを読み込んだ後に参照する
+    from src.config.settings import settings
+
+    setup_logging(log_level=settings.LOG_LEVEL)
     check_environment()
+    install_event_loop_policy()
     bot = create_bot()
     run_bot(bot)
 
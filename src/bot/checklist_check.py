@@ -4,6 +4,8 @@ Checklist item checking functionality.
 チェックリスト項目のチェック/アンチェック機能を提供します。
 """
 
+from datetime import datetime
+from operator import attrgetter
 from typing import Any
 
 import discord
@@ -13,6 +15,31 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_get_checked = attrgetter("checked")
+
+# 選択肢の説明文（固定文言は毎回フォーマットせずに使い回す）
+_DESC_ALL_DONE = "✅ すべて完了"
+_DESC_NONE = "⬜ 未着手"
+_DESC_CHECKED = "チェック済み"
+_DESC_UNCHECKED = "未チェック"
+_DESC_CHECKED_AUTO = f"{_DESC_CHECKED}... ⭐"
+_DESC_UNCHECKED_AUTO = f"{_DESC_UNCHECKED}... ⭐"
+
+
+def count_checked(items: list[ChecklistItem]) -> tuple[int, int]:
+    """(チェック済み数, 総数) を集計."""
+    return sum(map(_get_checked, items)), len(items)
+
+
+def build_category_progress(checklist: TripChecklist) -> dict[str, tuple[int, int]]:
+    """カテゴリ別の進捗 {category: (チェック済み数, 総数)} を集計.
+
+    同じチェックリストを複数のViewが同時に編集するため、描画のたびに項目から数え直す。
+    """
+    return {
+        category: count_checked(items) for category, items in checklist.items_by_category.items()
+    }
+
 
 class CategorySelectMenu(discord.ui.Select[Any]):
     """カテゴリ選択用のセレクトメニュー."""
@@ -27,21 +54,19 @@ class CategorySelectMenu(discord.ui.Select[Any]):
         self.checklist = checklist
         self.cog = cog
 
-        # カテゴリリストを作成
-        categories = list(checklist.items_by_category.keys())
         options = []
 
-        for category in categories[:25]:  # Discordの制限: 最大25個
-            items = checklist.items_by_category[category]
-            checked_count = sum(1 for item in items if item.checked)
-            total_count = len(items)
-
+        # Discordの制限: 最大25個
+        progress = build_category_progress(checklist)
+        for category, (checked_count, total_count) in list(progress.items())[:25]:
             # カテゴリの説明文を作成
-            description = f"{checked_count}/{total_count} 完了"
-            if checked_count == total_count:
-                description = "✅ すべて完了"
-            elif checked_count == 0:
-                description = "⬜ 未着手"
+            description = (
+                _DESC_ALL_DONE
+                if checked_count == total_count
+                else _DESC_NONE
+                if checked_count == 0
+                else f"{checked_count}/{total_count} 完了"
+            )
 
             option = discord.SelectOption(
                 label=category,
@@ -94,8 +119,9 @@ class ItemCheckView(discord.ui.View):
         self.current_page = 0
         self.items_per_page = 10
 
-        # アイテム選択メニューを追加
-        self.add_item(ItemSelectMenu(self.items, self.current_page, self.items_per_page, self))
+        # アイテム選択メニューを追加（以降はページ切り替え・トグル時に選択肢だけを差し替える）
+        self.select_menu = ItemSelectMenu(self.items, self.current_page, self.items_per_page, self)
+        self.add_item(self.select_menu)
 
         # ページネーションボタンを更新
         self.update_buttons()
@@ -109,8 +135,7 @@ class ItemCheckView(discord.ui.View):
         )
 
         # 進捗情報
-        checked_count = sum(1 for item in self.items if item.checked)
-        total_count = len(self.items)
+        checked_count, total_count = self.progress
         progress = (checked_count / total_count * 100) if total_count > 0 else 0
 
         embed.add_field(
@@ -139,6 +164,11 @@ class ItemCheckView(discord.ui.View):
 
         return embed
 
+    @property
+    def progress(self) -> tuple[int, int]:
+        """カテゴリ内の (チェック済み数, 総数)."""
+        return count_checked(self.items)
+
     @property
     def total_pages(self) -> int:
         """総ページ数を計算."""
@@ -153,6 +183,20 @@ class ItemCheckView(discord.ui.View):
                 elif item.custom_id == "next_page":
                     item.disabled = self.current_page >= self.total_pages - 1
 
+    def mark_updated(self) -> None:
+        """チェック状態の変更をチェックリストに反映."""
+        self.checklist.updated_at = datetime.now()
+        self.cog.store_checklist(self.checklist, persist=True)
+
+    async def rerender(
+        self, interaction: discord.Interaction, *, refresh_options: bool = True
+    ) -> None:
+        """セレクトメニューとボタンを更新し、メッセージを再描画."""
+        if refresh_options:
+            self.select_menu.refresh(self.current_page)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
     @discord.ui.button(
         label="⬅️ 前へ",
         style=discord.ButtonStyle.primary,
@@ -165,11 +209,7 @@ class ItemCheckView(discord.ui.View):
         """前のページへ."""
         if self.current_page > 0:
             self.current_page -= 1
-            # セレクトメニューを更新
-            self.clear_items()
-            self.add_item(ItemSelectMenu(self.items, self.current_page, self.items_per_page, self))
-            self.update_buttons()
-            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+            await self.rerender(interaction)
         else:
             await interaction.response.send_message("最初のページです", ephemeral=True)
 
@@ -185,11 +225,7 @@ class ItemCheckView(discord.ui.View):
         """次のページへ."""
         if self.current_page < self.total_pages - 1:
             self.current_page += 1
-            # セレクトメニューを更新
-            self.clear_items()
-            self.add_item(ItemSelectMenu(self.items, self.current_page, self.items_per_page, self))
-            self.update_buttons()
-            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+            await self.rerender(interaction)
         else:
             await interaction.response.send_message("最後のページです", ephemeral=True)
 
@@ -206,15 +242,8 @@ class ItemCheckView(discord.ui.View):
         for item in self.items:
             item.checked = True
 
-        # チェックリストを更新
-        self.cog.checklists[self.checklist.id] = self.checklist
-
-        # ビューを更新
-        self.clear_items()
-        self.add_item(ItemSelectMenu(self.items, self.current_page, self.items_per_page, self))
-        self.update_buttons()
-
-        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+        self.mark_updated()
+        await self.rerender(interaction)
         await interaction.followup.send(
             f"✅ {self.category}のすべてのアイテムをチェックしました！", ephemeral=True
         )
@@ -232,15 +261,8 @@ class ItemCheckView(discord.ui.View):
         for item in self.items:
             item.checked = False
 
-        # チェックリストを更新
-        self.cog.checklists[self.checklist.id] = self.checklist
-
-        # ビューを更新
-        self.clear_items()
-        self.add_item(ItemSelectMenu(self.items, self.current_page, self.items_per_page, self))
-        self.update_buttons()
-
-        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+        self.mark_updated()
+        await self.rerender(interaction)
         await interaction.followup.send(
             f"⬜ {self.category}のすべてのアイテムのチェックを解除しました。", ephemeral=True
         )
@@ -262,72 +284,73 @@ class ItemSelectMenu(discord.ui.Select[Any]):
         self.items_per_page = items_per_page
         self.parent_view = parent_view
 
-        # 現在のページのアイテムを取得
-        start_idx = current_page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(items))
-        page_items = items[start_idx:end_idx]
+        options = self._build_options(current_page)
+        super().__init__(
+            placeholder="チェックを切り替えるアイテムを選択（複数可）...",
+            min_values=0,
+            max_values=len(options),
+            options=options,
+            row=0,
+        )
+
+    def _build_options(self, page: int) -> list[discord.SelectOption]:
+        """指定ページのアイテムから選択肢を作成."""
+        start_idx = page * self.items_per_page
+        end_idx = min(start_idx + self.items_per_page, len(self.all_items))
+        page_items = self.all_items[start_idx:end_idx]
 
         options = []
         for i, item in enumerate(page_items):
             # グローバルインデックス
             global_idx = start_idx + i
 
-            # チェック状態を表すemoji
-            emoji = "✅" if item.checked else "⬜"
-
-            # 説明文
-            description = f"{'チェック済み' if item.checked else '未チェック'}"
-            if item.auto_added and item.reason:
-                description = f"{description[:40]}... ⭐"  # 説明文は最大50文字
-
             option = discord.SelectOption(
                 label=f"{global_idx + 1}. {item.name[:80]}",  # ラベルは最大100文字
-                description=description,
                 value=str(global_idx),
-                emoji=emoji,
             )
+            self._apply_check_state(option, item)
             options.append(option)
 
-        super().__init__(
-            placeholder="チェックを切り替えるアイテムを選択（複数可）...",
-            min_values=0,
-            max_values=len(options),
-            options=options,
-            row=0,
-        )
+        return options
+
+    @staticmethod
+    def _apply_check_state(option: discord.SelectOption, item: ChecklistItem) -> None:
+        """チェック状態に応じて選択肢のemojiと説明文を設定."""
+        # チェック状態を表すemoji
+        option.emoji = "✅" if item.checked else "⬜"
+
+        # 説明文（自動追加アイテムには⭐を付ける）
+        if item.auto_added and item.reason:
+            option.description = _DESC_CHECKED_AUTO if item.checked else _DESC_UNCHECKED_AUTO
+        else:
+            option.description = _DESC_CHECKED if item.checked else _DESC_UNCHECKED
+
+    def refresh(self, page: int) -> None:
+        """ページとチェック状態に合わせて選択肢を差し替える（コンポーネント自体は再生成しない）."""
+        self.current_page = page
+        self.options = self._build_options(page)
+        self.max_values = len(self.options)
 
     async def callback(self, interaction: discord.Interaction) -> None:
         """アイテムが選択されたときの処理."""
         # 選択されたアイテムのインデックスを取得
         selected_indices = [int(value) for value in self.values]
 
-        # チェック状態を切り替え
+        # チェック状態を切り替え、変化した選択肢だけを書き換える
+        options_by_value = {option.value: option for option in self.options}
         toggled_items = []
         for idx in selected_indices:
             if 0 <= idx < len(self.all_items):
                 item = self.all_items[idx]
                 item.checked = not item.checked
                 toggled_items.append((item.name, item.checked))
+                option = options_by_value.get(str(idx))
+                if option is not None:
+                    self._apply_check_state(option, item)
 
-        # チェックリストを更新
-        self.parent_view.cog.checklists[self.parent_view.checklist.id] = self.parent_view.checklist
-
-        # ビューを更新
-        self.parent_view.clear_items()
-        self.parent_view.add_item(
-            ItemSelectMenu(
-                self.all_items,
-                self.current_page,
-                self.items_per_page,
-                self.parent_view,
-            )
-        )
-        self.parent_view.update_buttons()
-
-        # メッセージを更新
-        await interaction.response.edit_message(
-            embed=self.parent_view.get_embed(), view=self.parent_view
-        )
+        # 選択肢は変更分だけ書き換え済みなので再構築しない
+        self.parent_view.mark_updated()
+        await self.parent_view.rerender(interaction, refresh_options=False)
 
         # フィードバックメッセージ
         if toggled_items:
@@ -374,9 +397,7 @@ class ChecklistCheckView(discord.ui.View):
 
         # カテゴリ別の進捗
         category_progress = []
-        for category, items in self.checklist.items_by_category.items():
-            checked = sum(1 for item in items if item.checked)
-            total = len(items)
+        for category, (checked, total) in build_category_progress(self.checklist).items():
             if checked == total:
                 status = "✅"
             elif checked == 0:
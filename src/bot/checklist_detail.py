@@ -5,6 +5,9 @@ Extension for showing full checklist details.
 """
 
 import io
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import chain
 from typing import Any
 
 import discord
@@ -13,39 +16,108 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 詳細テキストのキャッシュ: (チェックリストID, 更新日時, 完了数) -> 行
+_DETAIL_CACHE_SIZE = 128
+_detail_cache: OrderedDict[tuple[str, float, int], tuple[str, ...]] = OrderedDict()
+
+# 1ページあたりの最大文字数（Embed説明文の上限4096からコードブロック等の余白を引いた値）
+_PAGE_CHAR_BUDGET = 3900
+# 1メッセージに含められるEmbedの数と合計文字数の上限
+_MAX_EMBEDS_PER_MESSAGE = 10
+_MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# チェック状態の記号（boolでインデックスする: False -> ⬜, True -> ✅）
+CHECK_MARKS = ("⬜", "✅")
+
+
+def _paginate_lines(lines: Sequence[str], budget: int = _PAGE_CHAR_BUDGET) -> list[str]:
+    """行を文字数の上限に収まるようにページへ詰める."""
+    pages: list[str] = []
+    page: list[str] = []
+    size = 0
+    for line in lines:
+        # 1行だけで上限を超える場合は上限ごとに分割する
+        chunks = [line[i : i + budget] for i in range(0, len(line), budget)] or [""]
+        for chunk in chunks:
+            # 改行1文字分を含めて上限を超えるならページを確定する
+            added = len(chunk) + (1 if page else 0)
+            if page and size + added > budget:
+                pages.append("\n".join(page))
+                page, size = [], 0
+                added = len(chunk)
+            page.append(chunk)
+            size += added
+
+    if page:
+        pages.append("\n".join(page))
+    return pages
+
 
 class ChecklistDetailView(discord.ui.View):
     """チェックリスト詳細表示用のView."""
 
-    def __init__(self, checklist_data: str, timeout: float = 180):
+    _COLOR = discord.Color.blue()
+
+    def __init__(self, lines: Sequence[str], timeout: float = 180):
         """初期化."""
         super().__init__(timeout=timeout)
-        self.checklist_data = checklist_data
+        self.lines = lines
+        self._checklist_data: str | None = None
+        self._encoded: bytes | None = None
         self.current_page = 0
-        self.items_per_page = 20
+        # ページの内容を一度だけ作成し、以降の描画はインデックス参照のみにする
+        self.pages = [page or "内容がありません" for page in _paginate_lines(lines) or [""]]
+        self.total_pages = len(self.pages)
 
-        # チェックリストを行に分割
-        self.lines = checklist_data.split("\n")
-        self.total_pages = (len(self.lines) - 1) // self.items_per_page + 1
+    @property
+    def checklist_data(self) -> str:
+        """チェックリスト全文（ファイル送信時に初めて結合する）."""
+        if self._checklist_data is None:
+            self._checklist_data = "\n".join(self.lines)
+        return self._checklist_data
 
     def get_page_content(self) -> str:
         """現在のページの内容を取得."""
-        start_idx = self.current_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        page_lines = self.lines[start_idx:end_idx]
-
-        return "\n".join(page_lines) or "内容がありません"
+        return self.pages[self.current_page]
 
-    def get_embed(self) -> discord.Embed:
-        """現在のページのEmbedを作成."""
+    def _build_embed_for(self, page_index: int) -> discord.Embed:
+        """指定ページのEmbedを作成."""
         embed = discord.Embed(
-            title=f"📋 チェックリスト詳細 (ページ {self.current_page + 1}/{self.total_pages})",
-            description=f"```\n{self.get_page_content()}\n```",
-            color=discord.Color.blue(),
+            title=f"📋 チェックリスト詳細 (ページ {page_index + 1}/{self.total_pages})",
+            description=f"```\n{self.pages[page_index]}\n```",
+            color=self._COLOR,
         )
         embed.set_footer(text="⬅️前ページ / ➡️次ページ でナビゲート")
         return embed
 
+    def get_embed(self) -> discord.Embed:
+        """現在のページのEmbedを作成."""
+        return self._build_embed_for(self.current_page)
+
+    def build_all_page_batches(self) -> list[list[discord.Embed]]:
+        """全ページのEmbedを、1メッセージの上限に収まるまとまりごとに作成."""
+        batches: list[list[discord.Embed]] = []
+        batch: list[discord.Embed] = []
+        total_chars = 0
+        for page_index in range(self.total_pages):
+            embed = self._build_embed_for(page_index)
+            # Discordの制限: 1メッセージあたりEmbedは10個、合計文字数は6000まで
+            if batch and (
+                len(batch) >= _MAX_EMBEDS_PER_MESSAGE
+                or total_chars + len(embed) > _MAX_EMBED_CHARS_PER_MESSAGE
+            ):
+                batches.append(batch)
+                batch, total_chars = [], 0
+            batch.append(embed)
+            total_chars += len(embed)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def show_current_page(self, interaction: discord.Interaction) -> None:
+        """現在のページを表示."""
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
     @discord.ui.button(label="⬅️ 前へ", style=discord.ButtonStyle.primary)
     async def previous_page(
         self, interaction: discord.Interaction, button: discord.ui.Button[Any]
@@ -53,7 +125,7 @@ class ChecklistDetailView(discord.ui.View):
         """前のページへ."""
         if self.current_page > 0:
             self.current_page -= 1
-            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+            await self.show_current_page(interaction)
         else:
             await interaction.response.send_message("最初のページです", ephemeral=True)
 
@@ -64,57 +136,97 @@ class ChecklistDetailView(discord.ui.View):
         """次のページへ."""
         if self.current_page < self.total_pages - 1:
             self.current_page += 1
-            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+            await self.show_current_page(interaction)
         else:
             await interaction.response.send_message("最後のページです", ephemeral=True)
 
+    @discord.ui.button(label="📑 全ページ表示", style=discord.ButtonStyle.secondary)
+    async def show_all_pages(
+        self, interaction: discord.Interaction, button: discord.ui.Button[Any]
+    ) -> None:
+        """全ページを表示（1メッセージに収まらない分は続けて送信）."""
+        first, *rest = self.build_all_page_batches()
+        await interaction.response.send_message(embeds=first, ephemeral=True)
+        for embeds in rest:
+            await interaction.followup.send(embeds=embeds, ephemeral=True)
+
     @discord.ui.button(label="📄 テキストファイルで送信", style=discord.ButtonStyle.secondary)
     async def send_as_file(
         self, interaction: discord.Interaction, button: discord.ui.Button[Any]
     ) -> None:
         """テキストファイルとして送信."""
-        file = discord.File(
-            filename="checklist.txt", fp=io.BytesIO(self.checklist_data.encode("utf-8"))
-        )
+        # エンコードは初回のみ。discord.Fileは送信後にfpをcloseするため、BytesIOは毎回作り直す
+        # （既存のbytesを包むだけなのでコピーは発生せず、キャッシュしたbytesはそのまま残る）
+        if self._encoded is None:
+            self._encoded = self.checklist_data.encode("utf-8")
+        file = discord.File(filename="checklist.txt", fp=io.BytesIO(self._encoded))
+        # ファイルに全文が含まれるため、内容が重複するEmbedは添付しない
         await interaction.response.send_message(
             "チェックリストをテキストファイルとして送信します：", file=file, ephemeral=True
         )
 
 
-def create_detailed_checklist_text(checklist: Any) -> str:
-    """チェックリストの詳細テキストを作成."""
-    lines = []
+def _render_item(item: Any) -> tuple[str, ...]:
+    """アイテム1件分の行を作成（自動追加の理由があれば2行）."""
+    head = f"{CHECK_MARKS[item.checked]} {item.name}"
+    if item.auto_added and item.reason:
+        return (head, f"  - ⭐ {item.reason}")
+    return (head,)
 
+
+def _build_checklist_lines(checklist: Any) -> list[str]:
+    """チェックリストの詳細テキストを行単位で作成."""
     # Header
     trip_type = "出張" if checklist.purpose == "business" else "旅行"
-    lines.append(f"# {checklist.destination} {trip_type}チェックリスト")
-    lines.append("")
-    lines.append(f"**期間**: {checklist.start_date} ～ {checklist.end_date}")
-    lines.append(f"**目的**: {checklist.purpose}")
-    lines.append("")
-
-    # Items by category
-    if checklist.items:
-        for category, items in checklist.items_by_category.items():
-            lines.append(f"## {category}")
-            lines.append("")
-
-            for item in items:
-                check_mark = "✅" if item.checked else "⬜"
-                lines.append(f"{check_mark} {item.name}")
-                if item.auto_added and item.reason:
-                    lines.append(f"  - ⭐ {item.reason}")
+    lines = [
+        f"# {checklist.destination} {trip_type}チェックリスト",
+        "",
+        f"**期間**: {checklist.start_date} ～ {checklist.end_date}",
+        f"**目的**: {checklist.purpose}",
+        "",
+    ]
+
+    # Items by category（computed fieldなので一度だけ取得する）
+    categories = checklist.items_by_category
+    if categories:
+        for category, items in categories.items():
+            if not items:
+                continue
+            lines.extend((f"## {category}", ""))
+            lines.extend(chain.from_iterable(map(_render_item, items)))
             lines.append("")
     else:
-        lines.append("チェックリストにアイテムがありません")
-        lines.append("")
+        lines.extend(("チェックリストにアイテムがありません", ""))
 
     # Progress summary
-    lines.append("## 📊 進捗状況")
-    lines.append("")
     completion_percentage = f"{checklist.completion_percentage:.2f}%"
-    lines.append(
-        f"**完了**: {checklist.completed_count}/{checklist.total_count} ({completion_percentage})"
+    lines.extend(
+        (
+            "## 📊 進捗状況",
+            "",
+            f"**完了**: {checklist.completed_count}/{checklist.total_count} "
+            f"({completion_percentage})",
+        )
     )
 
-    return "\n".join(lines)
+    return lines
+
+
+def create_detailed_checklist_text(checklist: Any) -> str:
+    """チェックリストの詳細テキストを作成."""
+    return "\n".join(_build_checklist_lines(checklist))
+
+
+def get_detailed_checklist(checklist: Any) -> tuple[str, ...]:
+    """詳細テキストの行を取得（同じバージョンのチェックリストはキャッシュを返す）."""
+    key = (checklist.id, checklist.updated_at.timestamp(), checklist.completed_count)
+    cached = _detail_cache.get(key)
+    if cached is not None:
+        _detail_cache.move_to_end(key)
+        return cached
+
+    cached = tuple(_build_checklist_lines(checklist))
+    _detail_cache[key] = cached
+    if len(_detail_cache) > _DETAIL_CACHE_SIZE:
+        _detail_cache.popitem(last=False)
+    return cached
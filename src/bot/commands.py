@@ -4,55 +4,312 @@ Discord bot commands.
 Discord Botのコマンドとインタラクションを定義します。
 """
 
+import asyncio
+import functools
+import re
+import time
+from collections.abc import Awaitable, Callable, Coroutine
 from datetime import date, datetime
-from typing import Any
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, NamedTuple, Self
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from src.bot.checklist_check import ChecklistCheckView
-from src.bot.checklist_detail import ChecklistDetailView, create_detailed_checklist_text
+from src.bot.checklist_detail import CHECK_MARKS, ChecklistDetailView, get_detailed_checklist
+from src.bot.decorators import defer_first
 from src.config.settings import settings
-from src.core.github_sync import GitHubSync
+from src.core.github_sync import GitHubSync, get_shared_github_sync
 from src.core.smart_engine import SmartTemplateEngine
 from src.models import GitHubSyncError, TransportMethod, TripChecklist, TripPurpose, TripRequest
+from src.utils.cache import LRUCache
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 旅行の目的の表示名
+_PURPOSE_LABEL: dict[TripPurpose, str] = {"business": "出張", "leisure": "レジャー"}
+
+# 旅行の状態ごとの絵文字
+STATUS_EMOJI = {"planning": "📝", "ongoing": "✈️", "completed": "✅"}
+_DEFAULT_STATUS_EMOJI = "📋"
+
+# チェックリスト操作ボタンの種類: アクション -> (ラベル, スタイル)
+_CHECKLIST_ACTIONS: dict[str, tuple[str, discord.ButtonStyle]] = {
+    "check": ("✅ 項目をチェック", discord.ButtonStyle.green),
+    "details": ("📊 詳細表示", discord.ButtonStyle.primary),
+    "save": ("💾 保存", discord.ButtonStyle.gray),
+    "reschedule": ("📅 日程変更", discord.ButtonStyle.secondary),
+}
+
+
+# 複数の操作で共通のエラーメッセージ
+_MSG_GITHUB_DISABLED = "GitHub同期機能は無効になっています。"
+_MSG_GITHUB_NOT_INITIALIZED = "GitHub同期機能が初期化されていません。"
+_MSG_CHECKLIST_NOT_FOUND = "チェックリストが見つかりませんでした。"
+
+# 旅行選択ドロップダウンの選択肢数の上限（Discord制限）とラベルに含めるファイル名の長さ
+_MAX_SELECT_OPTIONS = 25
+_OPTION_FILENAME_MAX_LENGTH = 50
+
+# チェックリストIDとして受け付ける形式（ファイル名に使うため、パス区切りなどを含むIDは拒否する）
+_CHECKLIST_ID_PATTERN = re.compile(r"[\w-]+", re.ASCII)
+
+# 連続するチェック操作をまとめてディスクに書き出すまでの待ち時間（秒）
+_PERSIST_DELAY = 1.0
+
+# YYYY-MM-DD形式の日付（date.fromisoformatが受け付ける他の形式は除外する）
+_YMD_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+
+# ヘルプ表示用のEmbed（内容が固定のため起動時に一度だけ作成する）
+# 送信専用で共有するため変更しないこと（Embed.copyはフィールドを共有する浅いコピーにすぎない）
+_HELP_EMBED = (
+    discord.Embed(
+        title="🧳 TravelAssistant ヘルプ",
+        description="AI支援による旅行準備アシスタント",
+        color=discord.Color.blue(),
+    )
+    .add_field(
+        name="📋 利用可能なコマンド",
+        value=(
+            "`/trip_smart` - スマートチェックリスト生成\n"
+            "`/trip_reschedule` - 旅行の日程変更\n"
+            "`/trip_history` - 過去の旅行履歴\n"
+            "`/trip_check` - チェックリスト確認（開発中）"
+        ),
+        inline=False,
+    )
+    .add_field(
+        name="🚀 使い方",
+        value=(
+            "1. `/trip_smart`コマンドで必要情報を入力\n"
+            "2. 自動生成されたチェックリストを確認\n"
+            "3. ボタンでアイテムをチェック"
+        ),
+        inline=False,
+    )
+    .add_field(
+        name="✨ 特徴",
+        value="• 目的地・期間に応じた自動調整\n• 天気予報連携（開発中）\n• 個人最適化（開発中）",
+        inline=False,
+    )
+    .set_footer(text="Powered by Claude AI")
+)
+
+# 旅行履歴が空のときのEmbed
+_EMPTY_HISTORY_EMBED = discord.Embed(
+    title="📜 旅行履歴",
+    description="まだ保存された旅行はありません。",
+    color=discord.Color.blue(),
+)
+
+
+class _TripRow(NamedTuple):
+    """表示用に整形した旅行履歴1件分の値."""
+
+    checklist_id: str
+    filename: str
+    status_emoji: str
+    completion: str
+    updated: str
+    github_url: str
+
+
+def _normalize_trip(trip: dict[str, Any]) -> _TripRow:
+    """旅行履歴1件を表示用の値へ一度だけ整形する（Embedとドロップダウンで共有）."""
+    return _TripRow(
+        checklist_id=trip["checklist_id"],
+        filename=trip["filename"],
+        status_emoji=STATUS_EMOJI.get(trip.get("status", "planning"), _DEFAULT_STATUS_EMOJI),
+        completion=f"{trip.get('completion_percentage', 0):.1f}%",
+        updated=trip.get("updated_at", "不明")[:10],
+        github_url=trip["github_url"],
+    )
+
+
+def _parse_ymd(value: str) -> date:
+    """YYYY-MM-DD形式の文字列を日付に変換.
+
+    Raises:
+        ValueError: 形式が不正、または存在しない日付の場合
+    """
+    if not _YMD_PATTERN.fullmatch(value):
+        raise ValueError(f"Invalid date format: {value!r}")
+    return date.fromisoformat(value)
+
 
 class TripCommands(commands.Cog):
     """旅行準備関連のコマンド."""
 
-    def __init__(self, bot: commands.Bot):
-        """初期化."""
+    def __init__(
+        self,
+        bot: commands.Bot,
+        smart_engine: SmartTemplateEngine | None = None,
+        github_sync: GitHubSync | None = None,
+    ):
+        """初期化.
+
+        Args:
+            bot: Botインスタンス
+            smart_engine: チェックリスト生成エンジン（省略時はここで作成）
+            github_sync: GitHub同期機能（Noneの場合はGitHub連携なし）
+        """
         self.bot = bot
-        self.smart_engine = SmartTemplateEngine()
-        # チェックリストを一時的に保存（本来はDBやRedisを使用）
-        self.checklists: dict[str, TripChecklist] = {}
+        self.smart_engine = smart_engine if smart_engine is not None else SmartTemplateEngine()
+        # チェックリストのキャッシュ（上限・有効期限付きLRU。変更時はディスクにも書き出す）
+        self.checklists: LRUCache[str, TripChecklist] = LRUCache(
+            settings.CHECKLIST_CACHE_SIZE, ttl=settings.CHECKLIST_CACHE_TTL
+        )
+        # ユーザーID -> (作成日時, チェックリストID)。メモリの有効期限に左右されない最新の索引
+        # （ユーザーごとに1件のみ保持する）
+        self._latest_by_user: dict[str, tuple[datetime, str]] = {}
+        # 書き出し待ちのチェックリスト（短時間の連続更新を1回の書き込みにまとめる）
+        self._pending_writes: dict[str, TripChecklist] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        # チェックリストの永続キャッシュ保存先
+        self.checklist_cache_dir = settings.user_data_dir / "checklists"
+        self.checklist_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._purge_stale_files()
+        # 作成済みEmbedのキャッシュ: チェックリストID -> (バージョン, Embed)
+        self._embed_cache: LRUCache[str, tuple[tuple[float, int, int], discord.Embed]] = LRUCache(
+            settings.CHECKLIST_CACHE_SIZE
+        )
+        self.github_sync = github_sync
+        # 機能フラグは起動中に変わらないため一度だけ評価する
+        self._github_enabled = settings.is_feature_enabled("github")
+
+        logger.info("TripCommands cog initialized")
 
-        # GitHub同期機能の初期化
-        self.github_sync: GitHubSync | None = None
-        if settings.is_feature_enabled("github"):
+    async def cog_unload(self) -> None:
+        """書き出し待ちのチェックリストを保存してから終了."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush_pending_writes()
+
+    def _checklist_path(self, checklist_id: str) -> Path | None:
+        """チェックリストの保存先パス（IDが不正な形式ならNone）."""
+        if not _CHECKLIST_ID_PATTERN.fullmatch(checklist_id):
+            return None
+        return self.checklist_cache_dir / f"{checklist_id}.json"
+
+    def _purge_stale_files(self) -> None:
+        """保持期間を過ぎたチェックリストのファイルを削除."""
+        cutoff = time.time() - settings.CHECKLIST_DISK_TTL
+        for path in self.checklist_cache_dir.glob("*.json"):
             try:
-                self.github_sync = GitHubSync()
-                logger.info("GitHub sync initialized")
-            except GitHubSyncError as e:
-                logger.error(f"Failed to initialize GitHub sync: {e}")
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.warning("Failed to remove stale checklist file %s: %s", path.name, e)
+
+    def get_checklist(self, checklist_id: str) -> TripChecklist | None:
+        """チェックリストを取得（メモリになければディスクから読み込む）."""
+        checklist = self.checklists.get(checklist_id)
+        if checklist is not None:
+            return checklist
+
+        path = self._checklist_path(checklist_id)
+        if path is None or not path.is_file():
+            return None
+        try:
+            checklist = TripChecklist.model_validate_json(path.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to load cached checklist %s: %s", checklist_id, e)
+            return None
 
-        logger.info("TripCommands cog initialized")
+        self.store_checklist(checklist)
+        return checklist
+
+    async def load_remote_checklist(self, checklist_id: str, user_id: str) -> TripChecklist | None:
+        """GitHubからチェックリストを読み込み、キャッシュに保存（読み込めなければNone）."""
+        if self.github_sync is None:
+            return None
+        try:
+            checklist = await asyncio.to_thread(
+                self.github_sync.load_checklist, checklist_id, user_id
+            )
+        except GitHubSyncError as e:
+            logger.warning("Failed to load checklist %s from GitHub: %s", checklist_id, e)
+            return None
+        if checklist is not None:
+            self.store_checklist(checklist)
+        return checklist
+
+    def store_checklist(self, checklist: TripChecklist, persist: bool = False) -> None:
+        """チェックリストをキャッシュに保存（persist=Trueならディスクにも書き出す）.
+
+        イベントループ上では書き出しを少し遅らせてまとめ、別スレッドで行う。
+        """
+        self.checklists[checklist.id] = checklist
+        latest = self._latest_by_user.get(checklist.user_id)
+        if latest is None or checklist.created_at >= latest[0]:
+            self._latest_by_user[checklist.user_id] = (checklist.created_at, checklist.id)
+        if not persist:
+            return
+        self._pending_writes[checklist.id] = checklist
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # イベントループ外（起動処理やテスト）ではその場で書き出す
+            self._write_checklists(self._take_pending_writes())
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """待ち時間の後、書き出し待ちのチェックリストをまとめて保存.
+
+        書き込み中に追加された分も残さないよう、書き出し待ちがなくなるまで繰り返す。
+        """
+        while self._pending_writes:
+            await asyncio.sleep(_PERSIST_DELAY)
+            await self._flush_pending_writes()
+
+    async def _flush_pending_writes(self) -> None:
+        """書き出し待ちのチェックリストを別スレッドで保存."""
+        payloads = self._take_pending_writes()
+        if payloads:
+            await asyncio.to_thread(self._write_checklists, payloads)
+
+    def _take_pending_writes(self) -> list[tuple[str, str]]:
+        """書き出し待ちのチェックリストを (ID, JSON) として取り出す.
+
+        シリアライズはイベントループ上で行い、書き込み中の変更と競合しないようにする。
+        """
+        payloads = [
+            (checklist_id, checklist.model_dump_json())
+            for checklist_id, checklist in self._pending_writes.items()
+        ]
+        self._pending_writes.clear()
+        return payloads
+
+    def _write_checklists(self, payloads: list[tuple[str, str]]) -> None:
+        """シリアライズ済みのチェックリストをディスクに書き出す."""
+        for checklist_id, data in payloads:
+            path = self._checklist_path(checklist_id)
+            if path is None:
+                logger.warning("Refusing to persist checklist with invalid ID: %r", checklist_id)
+                continue
+            try:
+                path.write_text(data, encoding="utf-8")
+            except OSError as e:
+                logger.warning("Failed to persist checklist %s: %s", checklist_id, e)
 
     @app_commands.command(name="trip", description="旅行準備アシスタントのメインコマンド")
     @app_commands.describe(subcommand="実行するサブコマンド (smart/check/help)")
+    @defer_first()
     async def trip(self, interaction: discord.Interaction, subcommand: str = "help") -> None:
         """旅行準備アシスタントのメインコマンド."""
         if subcommand == "help":
             await self.show_help(interaction)
         else:
-            await interaction.response.send_message(
-                f"サブコマンド '{subcommand}' は実装されていません。"
-            )
+            await interaction.followup.send(f"サブコマンド '{subcommand}' は実装されていません。")
 
     @app_commands.command(name="trip_smart", description="スマートチェックリストを生成します")
     @app_commands.describe(
@@ -75,6 +332,7 @@ class TripCommands(commands.Cog):
             app_commands.Choice(name="その他", value="other"),
         ],
     )
+    @defer_first()
     async def trip_smart(
         self,
         interaction: discord.Interaction,
@@ -85,12 +343,10 @@ class TripCommands(commands.Cog):
         transport: TransportMethod | None = None,
     ) -> None:
         """スマートチェックリストを生成."""
-        await interaction.response.defer()
-
         try:
             # 日付の検証
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+            start_dt = _parse_ymd(start_date)
+            end_dt = _parse_ymd(end_date)
 
             if end_dt < start_dt:
                 await interaction.followup.send(
@@ -111,23 +367,23 @@ class TripCommands(commands.Cog):
             # チェックリスト生成
             checklist = await self.smart_engine.generate_checklist(request)
 
-            # チェックリストを一時保存
-            self.checklists[checklist.id] = checklist
+            # チェックリストを保存（メモリから破棄された後もボタン操作で読み込めるようにする）
+            self.store_checklist(checklist, persist=True)
 
             # Embed作成
             embed = self.create_checklist_embed(checklist)
-            view = ChecklistView(checklist.id, self)
+            view = ChecklistView(checklist.id)
 
             await interaction.followup.send(embed=embed, view=view)
 
-            logger.info(f"Generated checklist for user {interaction.user.id}: {checklist.id}")
+            logger.info("Generated checklist for user %s: %s", interaction.user.id, checklist.id)
 
         except ValueError as e:
             await interaction.followup.send(
                 f"❌ エラー: 日付の形式が正しくありません。YYYY-MM-DD形式で入力してください。\n{e}"
             )
         except Exception as e:
-            logger.error(f"Error generating checklist: {e}")
+            logger.error("Error generating checklist: %s", e)
             await interaction.followup.send("❌ チェックリストの生成中にエラーが発生しました。")
 
     @app_commands.command(name="trip_reschedule", description="既存の旅行の日程を変更します")
@@ -136,6 +392,7 @@ class TripCommands(commands.Cog):
         start_date="新しい開始日 (YYYY-MM-DD形式)",
         end_date="新しい終了日 (YYYY-MM-DD形式)",
     )
+    @defer_first()
     async def trip_reschedule(
         self,
         interaction: discord.Interaction,
@@ -144,12 +401,10 @@ class TripCommands(commands.Cog):
         checklist_id: str | None = None,
     ) -> None:
         """既存の旅行の日程を変更."""
-        await interaction.response.defer()
-
         try:
             # 日付の検証
-            new_start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-            new_end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+            new_start_date = _parse_ymd(start_date)
+            new_end_date = _parse_ymd(end_date)
 
             if new_end_date < new_start_date:
                 await interaction.followup.send(
@@ -180,13 +435,16 @@ class TripCommands(commands.Cog):
 
             # 更新されたチェックリストを表示
             checklist_embed = self.create_checklist_embed(checklist)
-            view = ChecklistView(checklist.id, self)
+            view = ChecklistView(checklist.id)
 
             await interaction.followup.send(embeds=[embed, checklist_embed], view=view)
 
             logger.info(
-                f"Rescheduled checklist {checklist.id} for user {user_id}: "
-                f"{result['old_dates']} -> {result['new_dates']}"
+                "Rescheduled checklist %s for user %s: %s -> %s",
+                checklist.id,
+                user_id,
+                result["old_dates"],
+                result["new_dates"],
             )
 
         except ValueError as e:
@@ -194,7 +452,7 @@ class TripCommands(commands.Cog):
                 f"❌ エラー: 日付の形式が正しくありません。YYYY-MM-DD形式で入力してください。\n{e}"
             )
         except Exception as e:
-            logger.error(f"Error rescheduling trip: {e}")
+            logger.error("Error rescheduling trip: %s", e)
             await interaction.followup.send("❌ 日程変更中にエラーが発生しました。")
 
     async def _get_checklist_for_reschedule(
@@ -203,18 +461,36 @@ class TripCommands(commands.Cog):
         """日程変更用のチェックリストを取得."""
         if checklist_id:
             # 指定されたIDのチェックリストを取得
-            checklist = self.checklists.get(checklist_id)
+            checklist = self.get_checklist(checklist_id)
             if checklist and checklist.user_id == user_id:
                 return checklist
             return None
 
-        # 最新のチェックリストを取得
-        user_checklists = [cl for cl in self.checklists.values() if cl.user_id == user_id]
-        if not user_checklists:
-            return None
+        # 作成日時が最新のチェックリストを取得（メモリから破棄されていてもディスクから読み込む）
+        latest = self._latest_by_user.get(user_id)
+        if latest is not None:
+            checklist = self.get_checklist(latest[1])
+            if checklist is not None:
+                return checklist
 
-        # 作成日時でソートして最新を取得
-        return sorted(user_checklists, key=lambda x: x.created_at, reverse=True)[0]
+        # 索引にない（再起動後など）、または保存されていなかった場合はディスク上から探す
+        checklist = await asyncio.to_thread(self._find_latest_on_disk, user_id)
+        if checklist is not None:
+            self.store_checklist(checklist)
+        return checklist
+
+    def _find_latest_on_disk(self, user_id: str) -> TripChecklist | None:
+        """ディスク上のユーザーのチェックリストから作成日時が最新のものを探す."""
+        candidates = []
+        for path in self.checklist_cache_dir.glob("*.json"):
+            try:
+                checklist = TripChecklist.model_validate_json(path.read_bytes())
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping unreadable checklist file %s: %s", path.name, e)
+                continue
+            if checklist.user_id == user_id:
+                candidates.append(checklist)
+        return max(candidates, key=attrgetter("created_at"), default=None)
 
     def _execute_reschedule(
         self, checklist: TripChecklist, new_start_date: date, new_end_date: date
@@ -232,10 +508,13 @@ class TripCommands(commands.Cog):
 
         new_duration = (new_end_date - new_start_date).days
 
-        # 調整メッセージを生成
+        # 調整メッセージを生成（期間に応じたアイテム追加もここで行われる）
         adjustment_msg = self._generate_adjustment_message(checklist, old_duration, new_duration)
         weather_update_msg = self._get_weather_update_message()
 
+        # 調整後の状態を保存
+        self.store_checklist(checklist, persist=True)
+
         description = (
             f"**{checklist.destination}**旅行の日程を更新しました。\n\n"
             f"**変更前**: {old_start_date} ～ {old_end_date} ({old_duration}泊)\n"
@@ -259,10 +538,7 @@ class TripCommands(commands.Cog):
         adjustments = checklist.adjust_for_duration_change(old_duration, new_duration)
 
         if adjustments:
-            msg = "\n\n📦 **期間変更に伴う調整:**\n"
-            for adj in adjustments:
-                msg += f"• {adj}\n"
-            return msg
+            return "\n\n📦 **期間変更に伴う調整:**\n" + "".join(f"• {adj}\n" for adj in adjustments)
 
         if new_duration > old_duration:
             return f"\n📦 期間が{old_duration}泊から{new_duration}泊に延長されました。"
@@ -279,32 +555,24 @@ class TripCommands(commands.Cog):
     @app_commands.describe(limit="表示する件数（デフォルト: 10件）")
     async def trip_history(self, interaction: discord.Interaction, limit: int = 10) -> None:
         """過去の旅行履歴を表示."""
-        if not settings.is_feature_enabled("github"):
-            await interaction.response.send_message(
-                "GitHub同期機能は無効になっています。", ephemeral=True
-            )
+        # 事前チェックのエラーは本人にだけ返し、履歴は公開の応答として表示する
+        if not self._github_enabled:
+            await interaction.response.send_message(_MSG_GITHUB_DISABLED, ephemeral=True)
             return
 
         if not self.github_sync:
-            await interaction.response.send_message(
-                "GitHub同期機能が初期化されていません。", ephemeral=True
-            )
+            await interaction.response.send_message(_MSG_GITHUB_NOT_INITIALIZED, ephemeral=True)
             return
 
         await interaction.response.defer()
 
         try:
-            # ユーザーの旅行履歴を取得
+            # ユーザーの旅行履歴を取得（同期APIのため別スレッドで実行）
             user_id = str(interaction.user.id)
-            trips = self.github_sync.get_user_trips(user_id, limit=limit)
+            trips = await asyncio.to_thread(self.github_sync.get_user_trips, user_id, limit=limit)
 
             if not trips:
-                embed = discord.Embed(
-                    title="📜 旅行履歴",
-                    description="まだ保存された旅行はありません。",
-                    color=discord.Color.blue(),
-                )
-                await interaction.followup.send(embed=embed)
+                await interaction.followup.send(embed=_EMPTY_HISTORY_EMBED)
                 return
 
             # 履歴のEmbedを作成
@@ -314,21 +582,15 @@ class TripCommands(commands.Cog):
                 color=discord.Color.blue(),
             )
 
-            for trip in trips[:10]:  # 最大10件まで表示
-                # ファイル名から情報を抽出
-                filename = trip["filename"]
-                status_emoji = {"planning": "📝", "ongoing": "✈️", "completed": "✅"}.get(
-                    trip.get("status", "planning"), "📋"
-                )
-
-                completion = trip.get("completion_percentage", 0)
-
+            # 表示する履歴（最大10件）を一度だけ整形し、Embedとドロップダウンで共有する
+            rows = [_normalize_trip(trip) for trip in trips[:10]]
+            for row in rows:
                 embed.add_field(
-                    name=f"{status_emoji} {filename}",
+                    name=f"{row.status_emoji} {row.filename}",
                     value=(
-                        f"**進捗**: {completion:.1f}%\n"
-                        f"**更新**: {trip.get('updated_at', '不明')[:10]}\n"
-                        f"[GitHubで表示]({trip['github_url']})"
+                        f"**進捗**: {row.completion}\n"
+                        f"**更新**: {row.updated}\n"
+                        f"[GitHubで表示]({row.github_url})"
                     ),
                     inline=True,
                 )
@@ -336,101 +598,75 @@ class TripCommands(commands.Cog):
             embed.set_footer(text=f"合計 {len(trips)} 件の旅行記録")
 
             # 履歴選択ビューを追加
-            view = TripHistoryView(trips[:10], self)
+            view = TripHistoryView(rows, self)
 
             await interaction.followup.send(embed=embed, view=view)
 
         except Exception as e:
-            logger.error(f"Error fetching trip history: {e}")
+            logger.error("Error fetching trip history: %s", e)
             await interaction.followup.send(
                 "❌ 旅行履歴の取得中にエラーが発生しました。", ephemeral=True
             )
 
     async def show_help(self, interaction: discord.Interaction) -> None:
         """ヘルプメッセージを表示."""
-        embed = discord.Embed(
-            title="🧳 TravelAssistant ヘルプ",
-            description="AI支援による旅行準備アシスタント",
-            color=discord.Color.blue(),
-        )
-
-        embed.add_field(
-            name="📋 利用可能なコマンド",
-            value=(
-                "`/trip_smart` - スマートチェックリスト生成\n"
-                "`/trip_reschedule` - 旅行の日程変更\n"
-                "`/trip_history` - 過去の旅行履歴\n"
-                "`/trip_check` - チェックリスト確認（開発中）"
-            ),
-            inline=False,
-        )
+        # 内容は常に同じなので、作成済みのEmbedをそのまま送る
+        await interaction.followup.send(embed=_HELP_EMBED)
 
-        embed.add_field(
-            name="🚀 使い方",
-            value=(
-                "1. `/trip_smart`コマンドで必要情報を入力\n"
-                "2. 自動生成されたチェックリストを確認\n"
-                "3. ボタンでアイテムをチェック"
-            ),
-            inline=False,
-        )
-
-        embed.add_field(
-            name="✨ 特徴",
-            value=(
-                "• 目的地・期間に応じた自動調整\n• 天気予報連携（開発中）\n• 個人最適化（開発中）"
-            ),
-            inline=False,
+    def create_checklist_embed(self, checklist: TripChecklist) -> discord.Embed:
+        """チェックリストのEmbedを作成（内容が変わっていなければキャッシュを返す）.
+
+        返すEmbedはキャッシュと共有されるため、呼び出し側で変更しないこと。
+        """
+        # チェック状態や日程の変更時は必ず updated_at が更新されるため、これをバージョンとする
+        version = (
+            checklist.updated_at.timestamp(),
+            checklist.completed_count,
+            checklist.total_count,
         )
+        cached = self._embed_cache.get(checklist.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-        embed.set_footer(text="Powered by Claude AI")
-
-        await interaction.response.send_message(embed=embed)
+        embed = self._build_checklist_embed(checklist)
+        self._embed_cache[checklist.id] = (version, embed)
+        return embed
 
-    def create_checklist_embed(self, checklist: TripChecklist) -> discord.Embed:
+    def _build_checklist_embed(self, checklist: TripChecklist) -> discord.Embed:
         """チェックリストのEmbedを作成."""
+        # computed fieldは参照のたびに全アイテムを走査するため、一度だけ計算する
+        completed = checklist.completed_count
+        total = checklist.total_count
+        percentage = completed / total * 100 if total else 0.0
+        categories = checklist.items_by_category
+
         embed = discord.Embed(
             title=f"🧳 {checklist.destination}旅行チェックリスト",
             description=(
                 f"**期間**: {checklist.start_date} ～ {checklist.end_date}\n"
-                f"**目的**: {'出張' if checklist.purpose == 'business' else 'レジャー'}\n"
-                f"**進捗**: {checklist.completion_percentage:.1f}% "
-                f"({checklist.completed_count}/{checklist.total_count})"
+                f"**目的**: {_PURPOSE_LABEL[checklist.purpose]}\n"
+                f"**進捗**: {percentage:.1f}% ({completed}/{total})"
             ),
-            color=discord.Color.green()
-            if checklist.completion_percentage >= 80
-            else discord.Color.blue(),
+            color=discord.Color.green() if percentage >= 80 else discord.Color.blue(),
         )
 
         # カテゴリ別に表示（最初の3カテゴリのみ）
-        for i, (category, items) in enumerate(checklist.items_by_category.items()):
-            if i >= 3:  # Embedのフィールド数制限対策
-                embed.add_field(
-                    name="...",
-                    value=f"他 {len(checklist.items_by_category) - 3} カテゴリ",
-                    inline=False,
-                )
-                break
-
+        for category, items in islice(categories.items(), 3):
             # 各カテゴリの最初の5項目を表示
-            value_lines = []
-            for _j, item in enumerate(items[:5]):
-                check_mark = "✅" if item.checked else "⬜"
-                value_lines.append(f"{check_mark} {item.name}")
+            value_lines = [f"{CHECK_MARKS[item.checked]} {item.name}" for item in items[:5]]
 
             if len(items) > 5:
                 value_lines.append(f"... 他{len(items) - 5}項目")
 
             embed.add_field(name=f"📋 {category}", value="\n".join(value_lines), inline=True)
 
+        if len(categories) > 3:  # Embedのフィールド数制限対策
+            embed.add_field(name="...", value=f"他 {len(categories) - 3} カテゴリ", inline=False)
+
         # 進捗フィールドを追加
-        progress_text = (
-            f"{checklist.completion_percentage:.2f}% "
-            f"({checklist.completed_count}/{checklist.total_count})"
-        )
         embed.add_field(
             name="📊 進捗",
-            value=progress_text,
+            value=f"{percentage:.2f}% ({completed}/{total})",
             inline=True,
         )
 
@@ -442,92 +678,160 @@ class TripCommands(commands.Cog):
 
 
 class ChecklistView(discord.ui.View):
-    """チェックリスト操作用のView."""
+    """チェックリスト操作用のView.
+
+    ボタンはcustom_idにチェックリストIDを含む ``ChecklistButton`` で構成され、
+    Bot全体で登録したDynamicItemとして処理される。メッセージごとにViewを保持しないため、
+    タイムアウトがなくBot再起動後も操作できる。
+    """
 
-    def __init__(self, checklist_id: str, cog: TripCommands, timeout: float = 300):
+    def __init__(self, checklist_id: str):
         """初期化."""
-        super().__init__(timeout=timeout)
+        super().__init__(timeout=None)
         self.checklist_id = checklist_id
-        self.cog = cog
+        for action in _CHECKLIST_ACTIONS:
+            self.add_item(ChecklistButton(action, checklist_id))
 
-    @discord.ui.button(
-        label="✅ 項目をチェック", style=discord.ButtonStyle.green, custom_id="check_items"
-    )
-    async def check_items(
-        self, interaction: discord.Interaction, button: discord.ui.Button[Any]
+
+type _ChecklistHandler = Callable[
+    [ChecklistButton, discord.Interaction, TripCommands, TripChecklist], Awaitable[None]
+]
+type _ButtonHandler = Callable[
+    [ChecklistButton, discord.Interaction, TripCommands], Coroutine[Any, Any, None]
+]
+
+
+def _require_checklist(func: _ChecklistHandler) -> _ButtonHandler:
+    """操作対象のチェックリストを取得してハンドラへ渡すデコレータ.
+
+    見つからない場合は共通のエラーメッセージを本人のみに送り、ハンドラは呼ばない。
+    """
+
+    @functools.wraps(func)
+    async def wrapper(
+        self: "ChecklistButton", interaction: discord.Interaction, cog: TripCommands
     ) -> None:
-        """チェックリスト項目をチェック."""
-        # チェックリストを取得
-        checklist = self.cog.checklists.get(self.checklist_id)
+        checklist = await self._resolve_checklist(interaction, cog)
+        if checklist is None:
+            await self._send_ephemeral(interaction, content=_MSG_CHECKLIST_NOT_FOUND)
+            return
+        await func(self, interaction, cog, checklist)
 
-        if not checklist:
+    return wrapper
+
+
+class ChecklistButton(
+    discord.ui.DynamicItem[discord.ui.Button[discord.ui.View]],
+    template=r"checklist:(?P<action>check|details|save|reschedule):(?P<checklist_id>[\w-]+)",
+):
+    """チェックリスト操作ボタン（custom_id: ``checklist:<アクション>:<チェックリストID>``）."""
+
+    def __init__(self, action: str, checklist_id: str):
+        """初期化."""
+        label, style = _CHECKLIST_ACTIONS[action]
+        super().__init__(
+            discord.ui.Button(
+                label=label, style=style, custom_id=f"checklist:{action}:{checklist_id}"
+            )
+        )
+        self.action = action
+        self.checklist_id = checklist_id
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Item[Any],
+        match: re.Match[str],
+    ) -> Self:
+        """custom_idからボタンを復元."""
+        return cls(match["action"], match["checklist_id"])
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        """押されたボタンに応じた処理を実行."""
+        cog = interaction.client.get_cog(TripCommands.__cog_name__)  # type: ignore[attr-defined]
+        if not isinstance(cog, TripCommands):
             await interaction.response.send_message(
-                "チェックリストが見つかりませんでした。", ephemeral=True
+                "現在この操作は利用できません。", ephemeral=True
             )
             return
 
+        match self.action:
+            case "check":
+                await self.check_items(interaction, cog)
+            case "details":
+                await self.show_details(interaction, cog)
+            case "save":
+                await self.save_checklist(interaction, cog)
+            case "reschedule":
+                await self.reschedule(interaction, cog)
+
+    async def _resolve_checklist(
+        self, interaction: discord.Interaction, cog: TripCommands
+    ) -> TripChecklist | None:
+        """操作対象のチェックリストを取得.
+
+        メモリとディスクになければGitHubから読み込む。その場合は応答期限に間に合うよう
+        （未応答なら）先にdeferするため、以降の応答は ``_send_ephemeral`` で行う。
+        """
+        checklist = cog.get_checklist(self.checklist_id)
+        if checklist is not None or cog.github_sync is None:
+            return checklist
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=True)
+        return await cog.load_remote_checklist(self.checklist_id, str(interaction.user.id))
+
+    @staticmethod
+    async def _send_ephemeral(interaction: discord.Interaction, **kwargs: Any) -> None:
+        """応答済みかどうかに応じて、本人のみに表示されるメッセージを送信."""
+        if interaction.response.is_done():
+            await interaction.followup.send(ephemeral=True, **kwargs)
+        else:
+            await interaction.response.send_message(ephemeral=True, **kwargs)
+
+    @_require_checklist
+    async def check_items(
+        self, interaction: discord.Interaction, cog: TripCommands, checklist: TripChecklist
+    ) -> None:
+        """チェックリスト項目をチェック."""
         # チェック機能ビューを作成
-        check_view = ChecklistCheckView(checklist, self.cog)
+        check_view = ChecklistCheckView(checklist, cog)
         embed = check_view.get_embed()
 
-        await interaction.response.send_message(embed=embed, view=check_view, ephemeral=True)
+        await self._send_ephemeral(interaction, embed=embed, view=check_view)
 
-    @discord.ui.button(
-        label="📊 詳細表示", style=discord.ButtonStyle.primary, custom_id="show_details"
-    )
+    @_require_checklist
     async def show_details(
-        self, interaction: discord.Interaction, button: discord.ui.Button[Any]
+        self, interaction: discord.Interaction, cog: TripCommands, checklist: TripChecklist
     ) -> None:
         """チェックリストの詳細を表示."""
-        # チェックリストを取得
-        checklist = self.cog.checklists.get(self.checklist_id)
-
-        if not checklist:
-            await interaction.response.send_message(
-                "チェックリストが見つかりませんでした。", ephemeral=True
-            )
-            return
-
-        # 詳細テキストを作成
-        detailed_text = create_detailed_checklist_text(checklist)
+        # 詳細テキストを作成（未変更ならキャッシュを再利用）
+        lines = get_detailed_checklist(checklist)
 
         # 詳細表示ビューを作成
-        detail_view = ChecklistDetailView(detailed_text)
+        detail_view = ChecklistDetailView(lines)
         embed = detail_view.get_embed()
 
-        await interaction.response.send_message(embed=embed, view=detail_view, ephemeral=True)
+        await self._send_ephemeral(interaction, embed=embed, view=detail_view)
 
-    @discord.ui.button(label="💾 保存", style=discord.ButtonStyle.gray, custom_id="save_checklist")
+    @defer_first(ephemeral=True)
+    @_require_checklist
     async def save_checklist(
-        self, interaction: discord.Interaction, button: discord.ui.Button[Any]
+        self, interaction: discord.Interaction, cog: TripCommands, checklist: TripChecklist
     ) -> None:
         """チェックリストを保存."""
-        if not settings.is_feature_enabled("github"):
-            await interaction.response.send_message(
-                "GitHub同期機能は無効になっています。", ephemeral=True
-            )
-            return
-
-        if not self.cog.github_sync:
-            await interaction.response.send_message(
-                "GitHub同期機能が初期化されていません。", ephemeral=True
-            )
+        if not cog._github_enabled:
+            await interaction.followup.send(_MSG_GITHUB_DISABLED, ephemeral=True)
             return
 
-        # チェックリストを取得
-        checklist = self.cog.checklists.get(self.checklist_id)
-        if not checklist:
-            await interaction.response.send_message(
-                "チェックリストが見つかりませんでした。", ephemeral=True
-            )
+        if not cog.github_sync:
+            await interaction.followup.send(_MSG_GITHUB_NOT_INITIALIZED, ephemeral=True)
             return
 
-        # 処理中のメッセージを表示
-        await interaction.response.defer(ephemeral=True)
-
         try:
-            # GitHub に保存
-            github_url = self.cog.github_sync.save_checklist(checklist)
+            # GitHub に保存（同期APIのため別スレッドで実行）
+            github_url = await asyncio.to_thread(cog.github_sync.save_checklist, checklist)
+            cog.store_checklist(checklist, persist=True)
 
             # 成功メッセージ
             embed = discord.Embed(
@@ -554,31 +858,25 @@ class ChecklistView(discord.ui.View):
             await interaction.followup.send(embed=embed, ephemeral=True)
 
         except GitHubSyncError as e:
-            logger.error(f"Failed to save checklist to GitHub: {e}")
+            logger.error("Failed to save checklist to GitHub: %s", e)
             await interaction.followup.send(
                 f"❌ GitHub保存中にエラーが発生しました: {e}", ephemeral=True
             )
         except Exception as e:
-            logger.error(f"Unexpected error saving checklist: {e}")
+            logger.error("Unexpected error saving checklist: %s", e)
             await interaction.followup.send("❌ 予期しないエラーが発生しました。", ephemeral=True)
 
-    @discord.ui.button(
-        label="📅 日程変更", style=discord.ButtonStyle.secondary, custom_id="reschedule"
-    )
-    async def reschedule(
-        self, interaction: discord.Interaction, button: discord.ui.Button[Any]
-    ) -> None:
+    async def reschedule(self, interaction: discord.Interaction, cog: TripCommands) -> None:
         """日程変更モーダルを表示."""
-        # チェックリストを取得
-        checklist = self.cog.checklists.get(self.checklist_id)
+        # チェックリストを取得（モーダルは最初の応答でしか表示できないため、
+        # deferが必要になるGitHubからの読み込みは行わない）
+        checklist = cog.get_checklist(self.checklist_id)
         if not checklist:
-            await interaction.response.send_message(
-                "チェックリストが見つかりませんでした。", ephemeral=True
-            )
+            await interaction.response.send_message(_MSG_CHECKLIST_NOT_FOUND, ephemeral=True)
             return
 
         # 日程変更モーダルを表示
-        modal = RescheduleModal(checklist, self.cog)
+        modal = RescheduleModal(checklist, cog)
         await interaction.response.send_modal(modal)
 
 
@@ -615,8 +913,8 @@ class RescheduleModal(discord.ui.Modal, title="旅行の日程を変更"):
         """送信時の処理."""
         try:
             # 日付の検証
-            new_start_date = datetime.strptime(self.start_date.value, "%Y-%m-%d").date()
-            new_end_date = datetime.strptime(self.end_date.value, "%Y-%m-%d").date()
+            new_start_date = _parse_ymd(self.start_date.value)
+            new_end_date = _parse_ymd(self.end_date.value)
 
             if new_end_date < new_start_date:
                 await interaction.response.send_message(
@@ -624,53 +922,29 @@ class RescheduleModal(discord.ui.Modal, title="旅行の日程を変更"):
                 )
                 return
 
-            # 日程変更前の情報を保存
-            old_start_date = self.checklist.start_date
-            old_end_date = self.checklist.end_date
-            old_duration = (old_end_date - old_start_date).days
-
-            # 日程を更新
-            self.checklist.start_date = new_start_date
-            self.checklist.end_date = new_end_date
-            self.checklist.updated_at = datetime.now()
-
-            # 日程変更に伴う調整
-            new_duration = (new_end_date - new_start_date).days
-            duration_changed = new_duration != old_duration
-
-            # 期間が変更された場合の調整
-            adjustment_msg = ""
-            if duration_changed:
-                adjustments = self.checklist.adjust_for_duration_change(old_duration, new_duration)
-
-                if adjustments:
-                    adjustment_msg = "\n\n📦 **期間変更に伴う調整:**\n"
-                    for adj in adjustments:
-                        adjustment_msg += f"• {adj}\n"
+            # 日程変更を実行（コマンドと同じ処理を共有する）
+            result = self.cog._execute_reschedule(self.checklist, new_start_date, new_end_date)
 
             # 成功メッセージ
             embed = discord.Embed(
                 title="✅ 日程を変更しました",
-                description=(
-                    f"**{self.checklist.destination}**旅行の日程を更新しました。\n\n"
-                    f"**変更前**: {old_start_date} ～ {old_end_date} ({old_duration}泊)\n"
-                    f"**変更後**: {new_start_date} ～ {new_end_date} ({new_duration}泊)"
-                    f"{adjustment_msg}"
-                ),
+                description=result["description"],
                 color=discord.Color.green(),
             )
 
             # 更新されたチェックリストを表示
             checklist_embed = self.cog.create_checklist_embed(self.checklist)
-            view = ChecklistView(self.checklist.id, self.cog)
+            view = ChecklistView(self.checklist.id)
 
             await interaction.response.send_message(
                 embeds=[embed, checklist_embed], view=view, ephemeral=False
             )
 
             logger.info(
-                f"Rescheduled checklist {self.checklist.id} via modal: "
-                f"{old_start_date} - {old_end_date} -> {new_start_date} - {new_end_date}"
+                "Rescheduled checklist %s via modal: %s -> %s",
+                self.checklist.id,
+                result["old_dates"],
+                result["new_dates"],
             )
 
         except ValueError as e:
@@ -679,7 +953,7 @@ class RescheduleModal(discord.ui.Modal, title="旅行の日程を変更"):
                 ephemeral=True,
             )
         except Exception as e:
-            logger.error(f"Error rescheduling trip via modal: {e}")
+            logger.error("Error rescheduling trip via modal: %s", e)
             await interaction.response.send_message(
                 "❌ 日程変更中にエラーが発生しました。", ephemeral=True
             )
@@ -688,40 +962,26 @@ class RescheduleModal(discord.ui.Modal, title="旅行の日程を変更"):
 class TripHistoryView(discord.ui.View):
     """旅行履歴選択用のView."""
 
-    def __init__(self, trips: list[dict[str, Any]], cog: TripCommands, timeout: float = 300):
+    def __init__(self, rows: list[_TripRow], cog: TripCommands, timeout: float = 120):
         """初期化."""
         super().__init__(timeout=timeout)
-        self.trips = trips
+        self.rows = rows
         self.cog = cog
 
         # ドロップダウンメニューを追加
-        if trips:
-            self.add_item(TripSelectDropdown(trips, cog))
+        if rows:
+            self.add_item(TripSelectDropdown(rows, cog))
 
 
 class TripSelectDropdown(discord.ui.Select[discord.ui.View]):
     """旅行選択ドロップダウン."""
 
-    def __init__(self, trips: list[dict[str, Any]], cog: TripCommands):
+    def __init__(self, rows: list[_TripRow], cog: TripCommands):
         """初期化."""
         self.cog = cog
 
-        # ドロップダウンのオプションを作成
-        options = []
-        for trip in trips[:25]:  # Discord制限：最大25個
-            filename = trip["filename"]
-            completion = trip.get("completion_percentage", 0)
-            status_emoji = {"planning": "📝", "ongoing": "✈️", "completed": "✅"}.get(
-                trip.get("status", "planning"), "📋"
-            )
-
-            options.append(
-                discord.SelectOption(
-                    label=f"{status_emoji} {filename[:50]}",  # 長すぎる場合は切り詰め
-                    description=f"進捗: {completion:.1f}% | {trip.get('updated_at', '不明')[:10]}",
-                    value=trip["checklist_id"],
-                )
-            )
+        # ドロップダウンのオプションを作成（Discord制限：最大25個）
+        options = [self._build_option(row) for row in rows[:_MAX_SELECT_OPTIONS]]
 
         super().__init__(
             placeholder="表示する旅行を選択してください...",
@@ -731,35 +991,45 @@ class TripSelectDropdown(discord.ui.Select[discord.ui.View]):
             custom_id="select_trip",
         )
 
+    @staticmethod
+    def _build_option(row: _TripRow) -> discord.SelectOption:
+        """旅行1件分の選択肢を作成."""
+        return discord.SelectOption(
+            # 長すぎる場合は切り詰め
+            label=f"{row.status_emoji} {row.filename[:_OPTION_FILENAME_MAX_LENGTH]}",
+            description=f"進捗: {row.completion} | {row.updated}",
+            value=row.checklist_id,
+        )
+
     async def callback(self, interaction: discord.Interaction) -> None:
         """選択されたときの処理."""
         checklist_id = self.values[0]
         user_id = str(interaction.user.id)
 
         if not self.cog.github_sync:
-            await interaction.response.send_message(
-                "GitHub同期機能が初期化されていません。", ephemeral=True
-            )
+            await interaction.response.send_message(_MSG_GITHUB_NOT_INITIALIZED, ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=True)
 
         try:
-            # チェックリストを読み込み
-            checklist = self.cog.github_sync.load_checklist(checklist_id, user_id)
+            # チェックリストを読み込み（キャッシュになければGitHubから）
+            checklist = self.cog.get_checklist(checklist_id)
+            if checklist is None or checklist.user_id != user_id:
+                checklist = await asyncio.to_thread(
+                    self.cog.github_sync.load_checklist, checklist_id, user_id
+                )
 
             if not checklist:
-                await interaction.followup.send(
-                    "チェックリストが見つかりませんでした。", ephemeral=True
-                )
+                await interaction.followup.send(_MSG_CHECKLIST_NOT_FOUND, ephemeral=True)
                 return
 
             # メモリに保存（操作できるように）
-            self.cog.checklists[checklist.id] = checklist
+            self.cog.store_checklist(checklist)
 
             # Embed作成
             embed = self.cog.create_checklist_embed(checklist)
-            view = ChecklistView(checklist.id, self.cog)
+            view = ChecklistView(checklist.id)
 
             await interaction.followup.send(
                 content="📋 チェックリストを読み込みました！",
@@ -768,13 +1038,37 @@ class TripSelectDropdown(discord.ui.Select[discord.ui.View]):
                 ephemeral=False,
             )
 
+            # 読み込んだチェックリストは永続ボタンで操作できるため、履歴のViewはここで終了する
+            if self.view is not None:
+                self.view.stop()
+
         except Exception as e:
-            logger.error(f"Error loading checklist from history: {e}")
+            logger.error("Error loading checklist from history: %s", e)
             await interaction.followup.send(
                 f"❌ チェックリストの読み込み中にエラーが発生しました: {e}", ephemeral=True
             )
 
 
+def _init_github_sync() -> GitHubSync | None:
+    """GitHub同期機能を初期化（無効または初期化に失敗した場合はNone）."""
+    if not settings.is_feature_enabled("github"):
+        return None
+    try:
+        github_sync = get_shared_github_sync()
+    except GitHubSyncError as e:
+        logger.error("Failed to initialize GitHub sync: %s", e)
+        return None
+    logger.info("GitHub sync initialized")
+    return github_sync
+
+
 async def setup(bot: commands.Bot) -> None:
     """Cogをセットアップ."""
-    await bot.add_cog(TripCommands(bot))
+    # 依存オブジェクトの初期化はファイル読み込み等を伴うため、イベントループを塞がないよう
+    # 別スレッドで並行して行う
+    smart_engine, github_sync = await asyncio.gather(
+        asyncio.to_thread(SmartTemplateEngine), asyncio.to_thread(_init_github_sync)
+    )
+    await bot.add_cog(TripCommands(bot, smart_engine, github_sync))
+    # チェックリスト操作ボタンはcustom_idで識別するため、Bot全体で一度だけ登録する
+    bot.add_dynamic_items(ChecklistButton)
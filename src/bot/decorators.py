@@ -0,0 +1,60 @@
+"""
+Decorators for Discord interaction handlers.
+
+インタラクションハンドラ共通のデコレータを提供します。
+"""
+
+import functools
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, Concatenate
+
+import discord
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+type InteractionHandler[S, **P, T] = Callable[
+    Concatenate[S, discord.Interaction, P], Coroutine[Any, Any, T]
+]
+
+
+def defer_first[S, **P, T](
+    *, thinking: bool = False, ephemeral: bool = False
+) -> Callable[
+    [Callable[Concatenate[S, discord.Interaction, P], Awaitable[T]]],
+    InteractionHandler[S, P, T],
+]:
+    """ハンドラ本体より先にインタラクションへ応答（defer）するデコレータ.
+
+    Discordはインタラクションに3秒以内の応答を要求するため、処理の前に必ずdeferする。
+    以降の応答はハンドラ側で ``interaction.followup.send`` を使う。
+    ハンドラ全体の処理時間はデバッグログに出力する。
+
+    Args:
+        thinking: コンポーネント操作時に「考え中...」を表示するか
+        ephemeral: 応答を本人のみに表示するか
+    """
+
+    def decorator(
+        func: Callable[Concatenate[S, discord.Interaction, P], Awaitable[T]],
+    ) -> InteractionHandler[S, P, T]:
+        @functools.wraps(func)
+        async def wrapper(
+            self: S, interaction: discord.Interaction, *args: P.args, **kwargs: P.kwargs
+        ) -> T:
+            started = time.perf_counter()
+            await interaction.response.defer(thinking=thinking, ephemeral=ephemeral)
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            finally:
+                logger.debug(
+                    "%s: total=%.1fms",
+                    func.__qualname__,
+                    (time.perf_counter() - started) * 1000,
+                )
+
+        return wrapper
+
+    return decorator
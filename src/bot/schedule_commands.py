@@ -6,63 +6,157 @@ Discord bot commands for schedule management.
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from src.core.github_sync import GitHubSync
+from src.bot.decorators import defer_first
+from src.config.settings import settings
+from src.core.github_sync import GitHubSync, get_shared_github_sync
 from src.models import (
     AccommodationInfo,
     FlightInfo,
     Meeting,
     TripItinerary,
 )
+from src.utils.cache import LRUCache
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# /scheduleのアクション: アクション名 -> (選択肢の表示名, ハンドラーのメソッド名)
+_SCHEDULE_ACTIONS: dict[str, tuple[str, str]] = {
+    "add_flight": ("✈️ フライトを追加", "_handle_add_flight"),
+    "add_hotel": ("🏨 宿泊を追加", "_handle_add_hotel"),
+    "add_meeting": ("📅 会議を追加", "_handle_add_meeting"),
+    "edit": ("📝 編集", "_handle_edit_schedule"),
+    "show": ("🗓️ 表示", "_handle_show_schedule"),
+    "save": ("💾 GitHubに保存", "_handle_save_schedule"),
+    "clear": ("🗑️ クリア", "_handle_clear_schedule"),
+}
+
+# 宿泊タイプとして指定できる値と、それ以外が入力された場合のメッセージ
+_HOTEL_TYPES = ("hotel", "ryokan", "airbnb", "friends", "other")
+_HOTEL_TYPE_ERROR = f"宿泊タイプは {', '.join(_HOTEL_TYPES)} のいずれかを指定してください"
+
+# 編集中に旅行行程がクリアされた、または項目が削除された場合のメッセージ
+_MSG_EDIT_TARGET_GONE = (
+    "📅 編集対象の項目が見つかりませんでした。/schedule の「編集」からもう一度選択してください。"
+)
+
+# モーダルで入力する日時の形式（YYYY-MM-DD HH:MM。strptimeと同様に月日時分の1桁も許可）
+_DATETIME_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2})", re.ASCII)
+
+
+def _parse_dt(value: str) -> datetime:
+    """YYYY-MM-DD HH:MM形式の文字列を日時に変換.
+
+    Raises:
+        ValueError: 形式が不正、または存在しない日時の場合
+    """
+    match = _DATETIME_PATTERN.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"日時は YYYY-MM-DD HH:MM 形式で入力してください: {value}")
+    return datetime(*map(int, match.groups()))
+
+
+def _find_by_id[T: FlightInfo | AccommodationInfo | Meeting](
+    items: list[T], item_id: str
+) -> T | None:
+    """IDが一致する項目を返す（なければNone）."""
+    return next((item for item in items if item.id == item_id), None)
+
+
+def _split_airports(value: str) -> tuple[str, str]:
+    """「出発空港 → 到着空港」形式の文字列を分割（区切りは → または ->）.
+
+    Raises:
+        ValueError: 区切りがない、または複数ある場合
+    """
+    departure, sep, arrival = value.partition("→")
+    if not sep:
+        departure, sep, arrival = value.partition("->")
+    if not sep or "→" in arrival or "->" in departure or "->" in arrival:
+        raise ValueError("出発空港と到着空港を → で区切って入力してください")
+    return departure.strip(), arrival.strip()
+
 
 class ScheduleCommands(commands.Cog):
     """スケジュール管理関連のコマンド."""
 
-    def __init__(self, bot: commands.Bot):
+    def __init__(self, bot: commands.Bot, github_sync: GitHubSync | None = None):
         """初期化."""
         self.bot = bot
-        # 旅行行程を一時的に保存（本来はDBやRedisを使用）
-        self.itineraries: dict[str, TripItinerary] = {}
-        # GitHub同期機能
-        self.github_sync = GitHubSync()
+        # ユーザーID -> 現在の旅行行程（上限・有効期限付きLRU。変更時はディスクにも書き出す）
+        self.itineraries: LRUCache[str, TripItinerary] = LRUCache(
+            settings.ITINERARY_CACHE_SIZE, ttl=settings.ITINERARY_CACHE_TTL
+        )
+        # 作成済みEmbedのキャッシュ: ユーザーID -> ((更新日時, 旅行ID), Embed)
+        self._embed_cache: LRUCache[str, tuple[tuple[datetime, str], discord.Embed]] = LRUCache(
+            settings.ITINERARY_CACHE_SIZE, ttl=settings.ITINERARY_CACHE_TTL
+        )
+        # 旅行行程の永続キャッシュ保存先と、書き込み・削除の順序を保つためのロック
+        self.itinerary_cache_dir = settings.user_data_dir / "itineraries"
+        self.itinerary_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._purge_stale_files()
+        self._io_lock = asyncio.Lock()
+        # ユーザーID -> 直近の/schedule実行時刻（レート制限用）
+        self._recent_calls: LRUCache[str, deque[float]] = LRUCache(settings.ITINERARY_CACHE_SIZE)
+        # GitHub同期機能（他のCogと同じインスタンスを共有する）
+        self.github_sync = github_sync if github_sync is not None else get_shared_github_sync()
         logger.info("ScheduleCommands cog initialized")
 
     @app_commands.command(name="schedule", description="旅行スケジュールを管理します")
-    @app_commands.describe(
-        action="実行するアクション (add_flight/add_hotel/add_meeting/edit/show/save/clear)"
+    @app_commands.describe(action="実行するアクション")
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name=label, value=action)
+            for action, (label, _handler_name) in _SCHEDULE_ACTIONS.items()
+        ]
     )
-    async def schedule(self, interaction: discord.Interaction, action: str) -> None:
+    async def schedule(
+        self, interaction: discord.Interaction, action: app_commands.Choice[str]
+    ) -> None:
         """スケジュール管理のメインコマンド."""
-        if action == "add_flight":
-            await self._handle_add_flight(interaction)
-        elif action == "add_hotel":
-            await self._handle_add_hotel(interaction)
-        elif action == "add_meeting":
-            await self._handle_add_meeting(interaction)
-        elif action == "edit":
-            await self._handle_edit_schedule(interaction)
-        elif action == "show":
-            await self._handle_show_schedule(interaction)
-        elif action == "save":
-            await self._handle_save_schedule(interaction)
-        elif action == "clear":
-            await self._handle_clear_schedule(interaction)
-        else:
+        retry_after = self._check_rate_limit(str(interaction.user.id))
+        if retry_after is not None:
             await interaction.response.send_message(
-                "❌ 無効なアクションです。"
-                "add_flight, add_hotel, add_meeting, edit, show, save, clear "
-                "のいずれかを指定してください。",
+                f"⏳ 操作が多すぎます。{math.ceil(retry_after)}秒後にもう一度お試しください。",
                 ephemeral=True,
             )
+            return
+
+        # 選択肢以外の値はDiscord側で弾かれるため、ここでは必ず登録済みのアクションになる
+        _label, handler_name = _SCHEDULE_ACTIONS[action.value]
+        await getattr(self, handler_name)(interaction)
+
+    def _check_rate_limit(self, user_id: str) -> float | None:
+        """レート制限を確認.
+
+        制限内なら実行を記録してNoneを、超えていれば再実行できるまでの秒数を返す。
+        """
+        now = time.monotonic()
+        window = settings.SCHEDULE_RATE_WINDOW
+        calls = self._recent_calls.get(user_id)
+        if calls is None:
+            calls = self._recent_calls[user_id] = deque()
+
+        # 時間枠より古い実行記録を捨てる
+        while calls and now - calls[0] >= window:
+            calls.popleft()
+
+        if len(calls) >= settings.SCHEDULE_RATE_LIMIT:
+            return window - (now - calls[0])
+        calls.append(now)
+        return None
 
     async def _handle_add_flight(self, interaction: discord.Interaction) -> None:
         """フライト情報追加のハンドラー."""
@@ -82,18 +176,18 @@ class ScheduleCommands(commands.Cog):
         modal = MeetingInputModal(self)
         await interaction.response.send_modal(modal)
 
+    @defer_first(ephemeral=True)
     async def _handle_edit_schedule(self, interaction: discord.Interaction) -> None:
         """スケジュール編集のハンドラー."""
-        user_id = str(interaction.user.id)
-        trip_id = f"{user_id}_current"
-
-        if trip_id not in self.itineraries:
-            await interaction.response.send_message(
-                "📅 編集するスケジュールがありません。", ephemeral=True
-            )
+        itinerary = await self.get_itinerary(str(interaction.user.id))
+        if itinerary is None:
+            await interaction.followup.send("📅 編集するスケジュールがありません。", ephemeral=True)
             return
 
-        itinerary = self.itineraries[trip_id]
+        # 編集できる項目がなければ、選択用のビューを作らずに案内だけ返す
+        if not (itinerary.flights or itinerary.accommodations or itinerary.meetings):
+            await interaction.followup.send("📅 編集できる項目がありません。", ephemeral=True)
+            return
 
         # 編集対象を選択するビューを表示
         view = EditScheduleSelectView(self, itinerary)
@@ -103,51 +197,43 @@ class ScheduleCommands(commands.Cog):
             color=discord.Color.blurple(),
         )
 
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
     async def _handle_show_schedule(self, interaction: discord.Interaction) -> None:
         """スケジュール表示のハンドラー."""
         user_id = str(interaction.user.id)
-        trip_id = f"{user_id}_current"  # 簡易的な実装
-
-        if trip_id not in self.itineraries:
+        itinerary = await self.get_itinerary(user_id)
+        if itinerary is None:
             await interaction.response.send_message(
                 "📅 まだスケジュールが登録されていません。", ephemeral=True
             )
             return
 
-        itinerary = self.itineraries[trip_id]
-        embed = self._create_schedule_embed(itinerary)
-        await interaction.response.send_message(embed=embed)
+        # 見つからない場合の案内は本人のみに表示するため、deferは存在を確認してから行う
+        await interaction.response.defer()
+        embed = self._create_schedule_embed(user_id, itinerary)
+        await interaction.followup.send(embed=embed)
 
+    @defer_first(ephemeral=True)
     async def _handle_clear_schedule(self, interaction: discord.Interaction) -> None:
         """スケジュールクリアのハンドラー."""
-        user_id = str(interaction.user.id)
-        trip_id = f"{user_id}_current"
-
-        if trip_id in self.itineraries:
-            del self.itineraries[trip_id]
-            await interaction.response.send_message(
-                "✅ スケジュールをクリアしました。", ephemeral=True
-            )
+        if await self.clear_itinerary(str(interaction.user.id)):
+            await interaction.followup.send("✅ スケジュールをクリアしました。", ephemeral=True)
         else:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "📅 クリアするスケジュールがありません。", ephemeral=True
             )
 
     async def _handle_save_schedule(self, interaction: discord.Interaction) -> None:
         """スケジュールをGitHubに保存するハンドラー."""
         user_id = str(interaction.user.id)
-        trip_id = f"{user_id}_current"
-
-        if trip_id not in self.itineraries:
+        itinerary = await self.get_itinerary(user_id)
+        if itinerary is None:
             await interaction.response.send_message(
                 "📅 保存するスケジュールがありません。", ephemeral=True
             )
             return
 
-        itinerary = self.itineraries[trip_id]
-
         # 保存先の目的地を旅行IDから抽出してtrip_idを更新
         if (
             not any(itinerary.flights)
@@ -178,15 +264,18 @@ class ScheduleCommands(commands.Cog):
             first_meeting = itinerary.meetings[0]
             date_str = first_meeting.start_time.strftime("%Y%m%d")
 
-        # trip_idを適切な形式に更新
-        itinerary.trip_id = f"{date_str}-{destination}"
-
         # 処理中メッセージ
         await interaction.response.defer(ephemeral=True)
 
+        # trip_idを適切な形式に更新し、次回ディスクから読み込んだときにも残るよう保存する
+        itinerary.trip_id = f"{date_str}-{destination}"
+        await self.store_itinerary(user_id, itinerary)
+
         try:
-            # GitHubに保存
-            github_url = self.github_sync.save_itinerary(itinerary, user_id)
+            # GitHubに保存（同期APIのため別スレッドで実行）
+            github_url = await asyncio.to_thread(
+                self.github_sync.save_itinerary, itinerary, user_id
+            )
 
             if github_url:
                 await interaction.followup.send(
@@ -198,138 +287,317 @@ class ScheduleCommands(commands.Cog):
                 )
 
         except Exception as e:
-            logger.error(f"Failed to save itinerary: {e}")
+            logger.exception("Failed to save itinerary: %s", e)
             await interaction.followup.send(
                 f"❌ GitHubへの保存中にエラーが発生しました: {e}", ephemeral=True
             )
 
-    def _create_schedule_embed(self, itinerary: TripItinerary) -> discord.Embed:
-        """スケジュール表示用のEmbed作成."""
+    def _create_schedule_embed(self, user_id: str, itinerary: TripItinerary) -> discord.Embed:
+        """スケジュール表示用のEmbed作成（旅行行程が未変更ならキャッシュを返す）."""
+        # 旅行IDの付け替えも確実に反映するため、更新日時に加えて旅行IDもバージョンに含める
+        version = (itinerary.updated_at, itinerary.trip_id)
+        cached = self._embed_cache.get(user_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         embed = discord.Embed(
             title="🗓️ 旅行スケジュール",
             description=f"旅行ID: {itinerary.trip_id}",
             color=discord.Color.blue(),
-            timestamp=datetime.now(),
+            timestamp=itinerary.updated_at,
         )
 
-        # タイムライン表示
+        for name, value, inline in self._build_schedule_fields(itinerary):
+            embed.add_field(name=name, value=value, inline=inline)
+
+        embed.set_footer(text="💡 /schedule の「フライトを追加」などで情報を追加できます")
+
+        self._embed_cache[user_id] = (version, embed)
+        return embed
+
+    @staticmethod
+    def _build_schedule_fields(itinerary: TripItinerary) -> tuple[tuple[str, str, bool], ...]:
+        """Embedのフィールド（名前, 値, インライン表示）を作成."""
+        fields: list[tuple[str, str, bool]] = []
+
+        # タイムライン表示（computed fieldのため一度だけ取得する）
         timeline_events = itinerary.timeline_events
         if timeline_events:
-            timeline_text = ""
-            for event_time, _event_type, event_desc in timeline_events[:10]:  # 最大10件
-                time_str = event_time.strftime("%m/%d %H:%M")
-                timeline_text += f"**{time_str}** {event_desc}\n"
-
+            lines = [
+                f"**{event_time.strftime('%m/%d %H:%M')}** {event_desc}"
+                for event_time, _event_type, event_desc in timeline_events[:10]  # 最大10件
+            ]
             if len(timeline_events) > 10:
-                timeline_text += f"\n... 他 {len(timeline_events) - 10} 件のイベント"
-
-            embed.add_field(
-                name="📋 タイムライン", value=timeline_text or "イベントなし", inline=False
-            )
+                lines.append(f"\n... 他 {len(timeline_events) - 10} 件のイベント")
+            fields.append(("📋 タイムライン", "\n".join(lines), False))
 
         # フライト情報
         if itinerary.flights:
-            flight_text = ""
-            for flight in itinerary.flights[:3]:
-                flight_text += (
-                    f"✈️ **{flight.flight_number}** ({flight.airline})\n"
-                    f"   {flight.departure_airport} → {flight.arrival_airport}\n"
-                    f"   {flight.scheduled_departure.strftime('%m/%d %H:%M')}\n"
-                )
-            embed.add_field(name="✈️ フライト", value=flight_text, inline=True)
+            flight_text = "".join(
+                f"✈️ **{flight.flight_number}** ({flight.airline})\n"
+                f"   {flight.departure_airport} → {flight.arrival_airport}\n"
+                f"   {flight.scheduled_departure.strftime('%m/%d %H:%M')}\n"
+                for flight in itinerary.flights[:3]
+            )
+            fields.append(("✈️ フライト", flight_text, True))
 
         # 宿泊情報
         if itinerary.accommodations:
-            hotel_text = ""
-            for hotel in itinerary.accommodations[:3]:
-                hotel_text += (
-                    f"🏨 **{hotel.name}**\n"
-                    f"   {hotel.nights}泊\n"
-                    f"   {hotel.check_in.strftime('%m/%d')} - {hotel.check_out.strftime('%m/%d')}\n"
-                )
-            embed.add_field(name="🏨 宿泊", value=hotel_text, inline=True)
+            hotel_text = "".join(
+                f"🏨 **{hotel.name}**\n"
+                f"   {hotel.nights}泊\n"
+                f"   {hotel.check_in.strftime('%m/%d')} - {hotel.check_out.strftime('%m/%d')}\n"
+                for hotel in itinerary.accommodations[:3]
+            )
+            fields.append(("🏨 宿泊", hotel_text, True))
 
         # 会議情報
         if itinerary.meetings:
-            meeting_text = ""
-            for meeting in itinerary.meetings[:3]:
-                meeting_text += (
-                    f"📅 **{meeting.title}**\n"
-                    f"   {meeting.location}\n"
-                    f"   {meeting.start_time.strftime('%m/%d %H:%M')}\n"
-                )
-            embed.add_field(name="📅 会議・イベント", value=meeting_text, inline=True)
+            meeting_text = "".join(
+                f"📅 **{meeting.title}**\n"
+                f"   {meeting.location}\n"
+                f"   {meeting.start_time.strftime('%m/%d %H:%M')}\n"
+                for meeting in itinerary.meetings[:3]
+            )
+            fields.append(("📅 会議・イベント", meeting_text, True))
+
+        return tuple(fields)
+
+    def _purge_stale_files(self) -> None:
+        """有効期限を過ぎた旅行行程のファイルを削除."""
+        cutoff = time.time() - settings.ITINERARY_CACHE_TTL
+        for path in self.itinerary_cache_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.warning("Failed to remove stale itinerary file %s: %s", path.name, e)
+
+    async def get_itinerary(self, user_id: str) -> TripItinerary | None:
+        """ユーザーの現在の旅行行程を取得（メモリになければディスクから読み込む）.
+
+        最終更新から有効期限を過ぎた行程はディスクからも削除し、Noneを返す。
+        """
+        itinerary = self.itineraries.get(user_id)
+        if itinerary is not None:
+            return itinerary
+
+        path = self.itinerary_cache_dir / f"{user_id}.json"
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Failed to load cached itinerary for %s: %s", user_id, e)
+            return None
+        try:
+            itinerary = TripItinerary.model_validate_json(data)
+        except ValueError as e:
+            logger.warning("Failed to parse cached itinerary for %s: %s", user_id, e)
+            return None
+
+        if itinerary.updated_at < datetime.now() - timedelta(seconds=settings.ITINERARY_CACHE_TTL):
+            logger.info("Discarding expired itinerary for %s", user_id)
+            async with self._io_lock:
+                # 待機中に保存し直されていれば、新しい内容を消さない
+                if user_id not in self.itineraries:
+                    try:
+                        await asyncio.to_thread(path.unlink, missing_ok=True)
+                    except OSError as e:
+                        logger.warning("Failed to delete expired itinerary for %s: %s", user_id, e)
+            return self.itineraries.get(user_id)
+
+        # 読み込み中に別の操作で保存・作成された場合はそちらを優先する
+        return self.itineraries.setdefault(user_id, itinerary)
+
+    async def get_or_create_itinerary(self, user_id: str) -> TripItinerary:
+        """ユーザーの現在の旅行行程を取得または作成."""
+        itinerary = await self.get_itinerary(user_id)
+        if itinerary is None:
+            itinerary = self.itineraries.setdefault(
+                user_id, TripItinerary(trip_id=f"{user_id}_current")
+            )
+        return itinerary
+
+    async def store_itinerary(self, user_id: str, itinerary: TripItinerary) -> None:
+        """変更した旅行行程をキャッシュに保存し、ディスクにも書き出す."""
+        itinerary.updated_at = datetime.now()
+        self.itineraries[user_id] = itinerary
+        # シリアライズはイベントループ上で行い、書き込みだけを別スレッドに任せる
+        data = itinerary.model_dump_json()
+        path = self.itinerary_cache_dir / f"{user_id}.json"
+        # ロックで書き込み順を保ち、古い内容が新しい内容を上書きしないようにする
+        async with self._io_lock:
+            try:
+                await asyncio.to_thread(path.write_text, data, encoding="utf-8")
+            except OSError as e:
+                logger.warning("Failed to persist itinerary for %s: %s", user_id, e)
+
+    async def clear_itinerary(self, user_id: str) -> bool:
+        """ユーザーの旅行行程を削除（削除するものがあればTrue）."""
+        cached = self.itineraries.pop(user_id, None) is not None
+        self._embed_cache.pop(user_id, None)
+        path = self.itinerary_cache_dir / f"{user_id}.json"
+        async with self._io_lock:
+            try:
+                await asyncio.to_thread(path.unlink)
+            except FileNotFoundError:
+                return cached
+            except OSError as e:
+                logger.warning("Failed to delete cached itinerary for %s: %s", user_id, e)
+        return True
+
+
+# モーダルの入力項目（追加用と編集用のモーダルで共有する）
+class _FlightForm(discord.ui.Modal):
+    """フライト情報の入力項目."""
+
+    flight_number: discord.ui.TextInput[_FlightForm] = discord.ui.TextInput(
+        label="便名", placeholder="例: JAL515", required=True, max_length=20
+    )
 
-        embed.set_footer(text="💡 /schedule add_flight などで情報を追加できます")
+    airline: discord.ui.TextInput[_FlightForm] = discord.ui.TextInput(
+        label="航空会社", placeholder="例: JAL", required=True, max_length=30
+    )
 
-        return embed
+    airports: discord.ui.TextInput[_FlightForm] = discord.ui.TextInput(
+        label="出発空港 → 到着空港", placeholder="例: HND → CTS", required=True, max_length=20
+    )
 
-    def get_or_create_itinerary(self, user_id: str) -> TripItinerary:
-        """ユーザーの現在の旅行行程を取得または作成."""
-        trip_id = f"{user_id}_current"
-        if trip_id not in self.itineraries:
-            self.itineraries[trip_id] = TripItinerary(trip_id=trip_id)
-        return self.itineraries[trip_id]
+    departure_time: discord.ui.TextInput[_FlightForm] = discord.ui.TextInput(
+        label="出発時刻", placeholder="例: 2025-07-01 08:00", required=True, max_length=20
+    )
 
+    arrival_time: discord.ui.TextInput[_FlightForm] = discord.ui.TextInput(
+        label="到着時刻", placeholder="例: 2025-07-01 09:35", required=True, max_length=20
+    )
 
-# モーダルクラス
-class FlightInputModal(discord.ui.Modal, title="フライト情報を入力"):
-    """フライト情報入力用モーダル."""
+    def _read_values(self) -> dict[str, Any]:
+        """入力値を検証し、FlightInfoのフィールド名をキーとする辞書にする."""
+        departure_airport, arrival_airport = _split_airports(self.airports.value)
 
-    def __init__(self, cog: ScheduleCommands):
-        """初期化."""
-        super().__init__()
-        self.cog = cog
+        return {
+            "flight_number": self.flight_number.value,
+            "airline": self.airline.value,
+            "departure_airport": departure_airport,
+            "arrival_airport": arrival_airport,
+            "scheduled_departure": _parse_dt(self.departure_time.value),
+            "scheduled_arrival": _parse_dt(self.arrival_time.value),
+        }
 
-    flight_number: discord.ui.TextInput[FlightInputModal] = discord.ui.TextInput(
-        label="便名", placeholder="例: JAL515", required=True, max_length=20
+
+class _HotelForm(discord.ui.Modal):
+    """宿泊情報の入力項目."""
+
+    hotel_name: discord.ui.TextInput[_HotelForm] = discord.ui.TextInput(
+        label="宿泊施設名", placeholder="例: 札幌グランドホテル", required=True, max_length=100
     )
 
-    airline: discord.ui.TextInput[FlightInputModal] = discord.ui.TextInput(
-        label="航空会社", placeholder="例: JAL", required=True, max_length=30
+    hotel_type: discord.ui.TextInput[_HotelForm] = discord.ui.TextInput(
+        label="宿泊タイプ",
+        placeholder="hotel/ryokan/airbnb/friends/other",
+        required=True,
+        default="hotel",
+        max_length=20,
     )
 
-    airports: discord.ui.TextInput[FlightInputModal] = discord.ui.TextInput(
-        label="出発空港 → 到着空港", placeholder="例: HND → CTS", required=True, max_length=20
+    check_in: discord.ui.TextInput[_HotelForm] = discord.ui.TextInput(
+        label="チェックイン日時", placeholder="例: 2025-07-01 15:00", required=True, max_length=20
     )
 
-    departure_time: discord.ui.TextInput[FlightInputModal] = discord.ui.TextInput(
-        label="出発時刻", placeholder="例: 2025-07-01 08:00", required=True, max_length=20
+    check_out: discord.ui.TextInput[_HotelForm] = discord.ui.TextInput(
+        label="チェックアウト日時", placeholder="例: 2025-07-03 11:00", required=True, max_length=20
     )
 
-    arrival_time: discord.ui.TextInput[FlightInputModal] = discord.ui.TextInput(
-        label="到着時刻", placeholder="例: 2025-07-01 09:35", required=True, max_length=20
+    address: discord.ui.TextInput[_HotelForm] = discord.ui.TextInput(
+        label="住所", placeholder="例: 札幌市中央区北1条西4丁目", required=True, max_length=200
     )
 
-    async def on_submit(self, interaction: discord.Interaction) -> None:
-        """送信時の処理."""
-        try:
-            # 空港コードを分割
-            airports_parts = self.airports.value.replace("→", "->").split("->")
-            if len(airports_parts) != 2:
-                raise ValueError("出発空港と到着空港を → で区切って入力してください")
+    def _read_values(self) -> dict[str, Any]:
+        """入力値を検証し、AccommodationInfoのフィールド名をキーとする辞書にする."""
+        # 時刻をパース
+        check_in_dt = _parse_dt(self.check_in.value)
+        check_out_dt = _parse_dt(self.check_out.value)
+
+        # 宿泊タイプのバリデーション
+        hotel_type = self.hotel_type.value.lower()
+        if hotel_type not in _HOTEL_TYPES:
+            raise ValueError(_HOTEL_TYPE_ERROR)
 
-            departure_airport = airports_parts[0].strip()
-            arrival_airport = airports_parts[1].strip()
+        return {
+            "name": self.hotel_name.value,
+            "type": hotel_type,
+            "check_in": check_in_dt,
+            "check_out": check_out_dt,
+            "address": self.address.value,
+        }
+
+
+class _MeetingForm(discord.ui.Modal):
+    """会議情報の入力項目."""
+
+    meeting_title: discord.ui.TextInput[_MeetingForm] = discord.ui.TextInput(
+        label="タイトル",
+        placeholder="例: プロジェクトキックオフ会議",
+        required=True,
+        max_length=100,
+    )
 
-            # 時刻をパース
-            departure_dt = datetime.strptime(self.departure_time.value, "%Y-%m-%d %H:%M")
-            arrival_dt = datetime.strptime(self.arrival_time.value, "%Y-%m-%d %H:%M")
+    location: discord.ui.TextInput[_MeetingForm] = discord.ui.TextInput(
+        label="場所", placeholder="例: 札幌オフィス 会議室A", required=True, max_length=100
+    )
 
+    start_time: discord.ui.TextInput[_MeetingForm] = discord.ui.TextInput(
+        label="開始時刻", placeholder="例: 2025-07-02 10:00", required=True, max_length=20
+    )
+
+    end_time: discord.ui.TextInput[_MeetingForm] = discord.ui.TextInput(
+        label="終了時刻", placeholder="例: 2025-07-02 12:00", required=True, max_length=20
+    )
+
+    attendees: discord.ui.TextInput[_MeetingForm] = discord.ui.TextInput(
+        label="参加者（カンマ区切り）",
+        placeholder="例: 田中, 佐藤, 鈴木",
+        required=False,
+        max_length=200,
+    )
+
+    def _read_values(self) -> dict[str, Any]:
+        """入力値を検証し、Meetingのフィールド名をキーとする辞書にする."""
+        # 参加者リストを作成
+        attendees_list = []
+        if self.attendees.value:
+            attendees_list = [a.strip() for a in self.attendees.value.split(",")]
+
+        return {
+            "title": self.meeting_title.value,
+            "location": self.location.value,
+            "start_time": _parse_dt(self.start_time.value),
+            "end_time": _parse_dt(self.end_time.value),
+            "attendees": attendees_list,
+        }
+
+
+# モーダルクラス
+class FlightInputModal(_FlightForm, title="フライト情報を入力"):
+    """フライト情報入力用モーダル."""
+
+    def __init__(self, cog: ScheduleCommands):
+        """初期化."""
+        super().__init__()
+        self.cog = cog
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        """送信時の処理."""
+        try:
             # フライト情報を作成
-            flight = FlightInfo(
-                flight_number=self.flight_number.value,
-                airline=self.airline.value,
-                departure_airport=departure_airport,
-                arrival_airport=arrival_airport,
-                scheduled_departure=departure_dt,
-                scheduled_arrival=arrival_dt,
-            )
+            flight = FlightInfo(**self._read_values())
 
             # 旅行行程に追加
             user_id = str(interaction.user.id)
-            itinerary = self.cog.get_or_create_itinerary(user_id)
+            itinerary = await self.cog.get_or_create_itinerary(user_id)
             itinerary.flights.append(flight)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
                 f"✅ フライト {flight.flight_number} を追加しました！", ephemeral=True
@@ -338,13 +606,13 @@ class FlightInputModal(discord.ui.Modal, title="フライト情報を入力"):
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error adding flight: {e}")
+            logger.exception("Error adding flight: %s", e)
             await interaction.response.send_message(
                 "❌ フライト情報の追加中にエラーが発生しました。", ephemeral=True
             )
 
 
-class HotelInputModal(discord.ui.Modal, title="宿泊情報を入力"):
+class HotelInputModal(_HotelForm, title="宿泊情報を入力"):
     """宿泊情報入力用モーダル."""
 
     def __init__(self, cog: ScheduleCommands):
@@ -352,58 +620,17 @@ class HotelInputModal(discord.ui.Modal, title="宿泊情報を入力"):
         super().__init__()
         self.cog = cog
 
-    hotel_name: discord.ui.TextInput[HotelInputModal] = discord.ui.TextInput(
-        label="宿泊施設名", placeholder="例: 札幌グランドホテル", required=True, max_length=100
-    )
-
-    hotel_type: discord.ui.TextInput[HotelInputModal] = discord.ui.TextInput(
-        label="宿泊タイプ",
-        placeholder="hotel/ryokan/airbnb/friends/other",
-        required=True,
-        default="hotel",
-        max_length=20,
-    )
-
-    check_in: discord.ui.TextInput[HotelInputModal] = discord.ui.TextInput(
-        label="チェックイン日時", placeholder="例: 2025-07-01 15:00", required=True, max_length=20
-    )
-
-    check_out: discord.ui.TextInput[HotelInputModal] = discord.ui.TextInput(
-        label="チェックアウト日時", placeholder="例: 2025-07-03 11:00", required=True, max_length=20
-    )
-
-    address: discord.ui.TextInput[HotelInputModal] = discord.ui.TextInput(
-        label="住所", placeholder="例: 札幌市中央区北1条西4丁目", required=True, max_length=200
-    )
-
     async def on_submit(self, interaction: discord.Interaction) -> None:
         """送信時の処理."""
         try:
-            # 時刻をパース
-            check_in_dt = datetime.strptime(self.check_in.value, "%Y-%m-%d %H:%M")
-            check_out_dt = datetime.strptime(self.check_out.value, "%Y-%m-%d %H:%M")
-
-            # 宿泊タイプのバリデーション
-            valid_types = {"hotel", "ryokan", "airbnb", "friends", "other"}
-            hotel_type = self.hotel_type.value.lower()
-            if hotel_type not in valid_types:
-                raise ValueError(
-                    f"宿泊タイプは {', '.join(valid_types)} のいずれかを指定してください"
-                )
-
             # 宿泊情報を作成
-            hotel = AccommodationInfo(
-                name=self.hotel_name.value,
-                type=hotel_type,  # type: ignore[arg-type]
-                check_in=check_in_dt,
-                check_out=check_out_dt,
-                address=self.address.value,
-            )
+            hotel = AccommodationInfo(**self._read_values())
 
             # 旅行行程に追加
             user_id = str(interaction.user.id)
-            itinerary = self.cog.get_or_create_itinerary(user_id)
+            itinerary = await self.cog.get_or_create_itinerary(user_id)
             itinerary.accommodations.append(hotel)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
                 f"✅ 宿泊施設 {hotel.name} を追加しました！（{hotel.nights}泊）", ephemeral=True
@@ -412,13 +639,13 @@ class HotelInputModal(discord.ui.Modal, title="宿泊情報を入力"):
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error adding hotel: {e}")
+            logger.exception("Error adding hotel: %s", e)
             await interaction.response.send_message(
                 "❌ 宿泊情報の追加中にエラーが発生しました。", ephemeral=True
             )
 
 
-class MeetingInputModal(discord.ui.Modal, title="会議・イベント情報を入力"):
+class MeetingInputModal(_MeetingForm, title="会議・イベント情報を入力"):
     """会議情報入力用モーダル."""
 
     def __init__(self, cog: ScheduleCommands):
@@ -426,57 +653,17 @@ class MeetingInputModal(discord.ui.Modal, title="会議・イベント情報を
         super().__init__()
         self.cog = cog
 
-    meeting_title: discord.ui.TextInput[MeetingInputModal] = discord.ui.TextInput(
-        label="タイトル",
-        placeholder="例: プロジェクトキックオフ会議",
-        required=True,
-        max_length=100,
-    )
-
-    location: discord.ui.TextInput[MeetingInputModal] = discord.ui.TextInput(
-        label="場所", placeholder="例: 札幌オフィス 会議室A", required=True, max_length=100
-    )
-
-    start_time: discord.ui.TextInput[MeetingInputModal] = discord.ui.TextInput(
-        label="開始時刻", placeholder="例: 2025-07-02 10:00", required=True, max_length=20
-    )
-
-    end_time: discord.ui.TextInput[MeetingInputModal] = discord.ui.TextInput(
-        label="終了時刻", placeholder="例: 2025-07-02 12:00", required=True, max_length=20
-    )
-
-    attendees: discord.ui.TextInput[MeetingInputModal] = discord.ui.TextInput(
-        label="参加者（カンマ区切り）",
-        placeholder="例: 田中, 佐藤, 鈴木",
-        required=False,
-        max_length=200,
-    )
-
     async def on_submit(self, interaction: discord.Interaction) -> None:
         """送信時の処理."""
         try:
-            # 時刻をパース
-            start_dt = datetime.strptime(self.start_time.value, "%Y-%m-%d %H:%M")
-            end_dt = datetime.strptime(self.end_time.value, "%Y-%m-%d %H:%M")
-
-            # 参加者リストを作成
-            attendees_list = []
-            if self.attendees.value:
-                attendees_list = [a.strip() for a in self.attendees.value.split(",")]
-
             # 会議情報を作成
-            meeting = Meeting(
-                title=self.meeting_title.value,
-                location=self.location.value,
-                start_time=start_dt,
-                end_time=end_dt,
-                attendees=attendees_list,
-            )
+            meeting = Meeting(**self._read_values())
 
             # 旅行行程に追加
             user_id = str(interaction.user.id)
-            itinerary = self.cog.get_or_create_itinerary(user_id)
+            itinerary = await self.cog.get_or_create_itinerary(user_id)
             itinerary.meetings.append(meeting)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
                 f"✅ 会議 「{meeting.title}」 を追加しました！", ephemeral=True
@@ -485,7 +672,7 @@ class MeetingInputModal(discord.ui.Modal, title="会議・イベント情報を
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error adding meeting: {e}")
+            logger.exception("Error adding meeting: %s", e)
             await interaction.response.send_message(
                 "❌ 会議情報の追加中にエラーが発生しました。", ephemeral=True
             )
@@ -566,14 +753,19 @@ class FlightSelectView(discord.ui.View):
         self.cog = cog
         self.itinerary = itinerary
 
+        items = itinerary.flights[:25]  # Discord制限により最大25項目
+        # 選択肢のIDから項目を引くための辞書
+        self._by_id: dict[str, FlightInfo] = {flight.id: flight for flight in items}
+
         # ドロップダウンメニューを追加
-        options = []
-        for flight in itinerary.flights[:25]:  # Discord制限により最大25項目
-            label = f"{flight.flight_number} ({flight.airline})"
-            description = f"{flight.departure_airport} → {flight.arrival_airport}"
-            options.append(
-                discord.SelectOption(label=label, description=description, value=flight.id)
+        options = [
+            discord.SelectOption(
+                label=f"{flight.flight_number} ({flight.airline})",
+                description=f"{flight.departure_airport} → {flight.arrival_airport}",
+                value=flight.id,
             )
+            for flight in items
+        ]
 
         self.select: discord.ui.Select[FlightSelectView] = discord.ui.Select(
             placeholder="編集するフライトを選択", min_values=1, max_values=1, options=options
@@ -583,14 +775,7 @@ class FlightSelectView(discord.ui.View):
 
     async def flight_callback(self, interaction: discord.Interaction) -> None:
         """フライト選択時のコールバック."""
-        flight_id = self.select.values[0]
-
-        # 選択されたフライトを検索
-        selected_flight = None
-        for flight in self.itinerary.flights:
-            if flight.id == flight_id:
-                selected_flight = flight
-                break
+        selected_flight = self._by_id.get(self.select.values[0])
 
         if not selected_flight:
             await interaction.response.send_message("フライトが見つかりません。", ephemeral=True)
@@ -610,16 +795,21 @@ class HotelSelectView(discord.ui.View):
         self.cog = cog
         self.itinerary = itinerary
 
+        items = itinerary.accommodations[:25]  # Discord制限により最大25項目
+        # 選択肢のIDから項目を引くための辞書
+        self._by_id: dict[str, AccommodationInfo] = {hotel.id: hotel for hotel in items}
+
         # ドロップダウンメニューを追加
-        options = []
-        for hotel in itinerary.accommodations[:25]:
-            label = hotel.name
-            description = (
-                f"{hotel.check_in.strftime('%m/%d')} - {hotel.check_out.strftime('%m/%d')}"
-            )
-            options.append(
-                discord.SelectOption(label=label, description=description, value=hotel.id)
+        options = [
+            discord.SelectOption(
+                label=hotel.name,
+                description=(
+                    f"{hotel.check_in.strftime('%m/%d')} - {hotel.check_out.strftime('%m/%d')}"
+                ),
+                value=hotel.id,
             )
+            for hotel in items
+        ]
 
         self.select: discord.ui.Select[HotelSelectView] = discord.ui.Select(
             placeholder="編集する宿泊施設を選択", min_values=1, max_values=1, options=options
@@ -629,14 +819,7 @@ class HotelSelectView(discord.ui.View):
 
     async def hotel_callback(self, interaction: discord.Interaction) -> None:
         """宿泊施設選択時のコールバック."""
-        hotel_id = self.select.values[0]
-
-        # 選択された宿泊施設を検索
-        selected_hotel = None
-        for hotel in self.itinerary.accommodations:
-            if hotel.id == hotel_id:
-                selected_hotel = hotel
-                break
+        selected_hotel = self._by_id.get(self.select.values[0])
 
         if not selected_hotel:
             await interaction.response.send_message("宿泊施設が見つかりません。", ephemeral=True)
@@ -656,14 +839,19 @@ class MeetingSelectView(discord.ui.View):
         self.cog = cog
         self.itinerary = itinerary
 
+        items = itinerary.meetings[:25]  # Discord制限により最大25項目
+        # 選択肢のIDから項目を引くための辞書
+        self._by_id: dict[str, Meeting] = {meeting.id: meeting for meeting in items}
+
         # ドロップダウンメニューを追加
-        options = []
-        for meeting in itinerary.meetings[:25]:
-            label = meeting.title
-            description = f"{meeting.start_time.strftime('%m/%d %H:%M')} @ {meeting.location}"
-            options.append(
-                discord.SelectOption(label=label, description=description, value=meeting.id)
+        options = [
+            discord.SelectOption(
+                label=meeting.title,
+                description=f"{meeting.start_time.strftime('%m/%d %H:%M')} @ {meeting.location}",
+                value=meeting.id,
             )
+            for meeting in items
+        ]
 
         self.select: discord.ui.Select[MeetingSelectView] = discord.ui.Select(
             placeholder="編集する会議を選択", min_values=1, max_values=1, options=options
@@ -673,14 +861,7 @@ class MeetingSelectView(discord.ui.View):
 
     async def meeting_callback(self, interaction: discord.Interaction) -> None:
         """会議選択時のコールバック."""
-        meeting_id = self.select.values[0]
-
-        # 選択された会議を検索
-        selected_meeting = None
-        for meeting in self.itinerary.meetings:
-            if meeting.id == meeting_id:
-                selected_meeting = meeting
-                break
+        selected_meeting = self._by_id.get(self.select.values[0])
 
         if not selected_meeting:
             await interaction.response.send_message("会議が見つかりません。", ephemeral=True)
@@ -692,14 +873,15 @@ class MeetingSelectView(discord.ui.View):
 
 
 # 編集用モーダル
-class FlightEditModal(discord.ui.Modal, title="フライト情報を編集"):
+class FlightEditModal(_FlightForm, title="フライト情報を編集"):
     """フライト編集用モーダル."""
 
     def __init__(self, cog: ScheduleCommands, flight: FlightInfo):
         """初期化."""
         super().__init__()
         self.cog = cog
-        self.flight = flight
+        # 送信時に最新の旅行行程から引き直すため、項目はIDで保持する
+        self.flight_id = flight.id
 
         # 既存の値をセット
         self.flight_number.default = flight.flight_number
@@ -708,70 +890,44 @@ class FlightEditModal(discord.ui.Modal, title="フライト情報を編集"):
         self.departure_time.default = flight.scheduled_departure.strftime("%Y-%m-%d %H:%M")
         self.arrival_time.default = flight.scheduled_arrival.strftime("%Y-%m-%d %H:%M")
 
-    flight_number: discord.ui.TextInput[FlightEditModal] = discord.ui.TextInput(
-        label="便名", placeholder="例: JAL515", required=True, max_length=20
-    )
-
-    airline: discord.ui.TextInput[FlightEditModal] = discord.ui.TextInput(
-        label="航空会社", placeholder="例: JAL", required=True, max_length=30
-    )
-
-    airports: discord.ui.TextInput[FlightEditModal] = discord.ui.TextInput(
-        label="出発空港 → 到着空港", placeholder="例: HND → CTS", required=True, max_length=20
-    )
-
-    departure_time: discord.ui.TextInput[FlightEditModal] = discord.ui.TextInput(
-        label="出発時刻", placeholder="例: 2025-07-01 08:00", required=True, max_length=20
-    )
-
-    arrival_time: discord.ui.TextInput[FlightEditModal] = discord.ui.TextInput(
-        label="到着時刻", placeholder="例: 2025-07-01 09:35", required=True, max_length=20
-    )
-
     async def on_submit(self, interaction: discord.Interaction) -> None:
         """送信時の処理."""
         try:
-            # 空港コードを分割
-            airports_parts = self.airports.value.replace("→", "->").split("->")
-            if len(airports_parts) != 2:
-                raise ValueError("出発空港と到着空港を → で区切って入力してください")
-
-            departure_airport = airports_parts[0].strip()
-            arrival_airport = airports_parts[1].strip()
-
-            # 時刻をパース
-            departure_dt = datetime.strptime(self.departure_time.value, "%Y-%m-%d %H:%M")
-            arrival_dt = datetime.strptime(self.arrival_time.value, "%Y-%m-%d %H:%M")
+            # モーダル表示中にクリア・再読み込みされている可能性があるため、最新の行程を取得する
+            user_id = str(interaction.user.id)
+            itinerary = await self.cog.get_itinerary(user_id)
+            flight = _find_by_id(itinerary.flights, self.flight_id) if itinerary else None
+            if itinerary is None or flight is None:
+                await interaction.response.send_message(_MSG_EDIT_TARGET_GONE, ephemeral=True)
+                return
 
             # フライト情報を更新
-            self.flight.flight_number = self.flight_number.value
-            self.flight.airline = self.airline.value
-            self.flight.departure_airport = departure_airport
-            self.flight.arrival_airport = arrival_airport
-            self.flight.scheduled_departure = departure_dt
-            self.flight.scheduled_arrival = arrival_dt
+            for name, value in self._read_values().items():
+                setattr(flight, name, value)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
-                f"✅ フライト {self.flight.flight_number} を更新しました！", ephemeral=True
+                f"✅ フライト {flight.flight_number} を更新しました！", ephemeral=True
             )
 
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error editing flight: {e}")
+            logger.exception("Error editing flight: %s", e)
             await interaction.response.send_message(
                 "❌ フライト情報の更新中にエラーが発生しました。", ephemeral=True
             )
 
 
-class HotelEditModal(discord.ui.Modal, title="宿泊情報を編集"):
+class HotelEditModal(_HotelForm, title="宿泊情報を編集"):
     """宿泊情報編集用モーダル."""
 
     def __init__(self, cog: ScheduleCommands, hotel: AccommodationInfo):
         """初期化."""
         super().__init__()
         self.cog = cog
-        self.hotel = hotel
+        # 送信時に最新の旅行行程から引き直すため、項目はIDで保持する
+        self.hotel_id = hotel.id
 
         # 既存の値をセット
         self.hotel_name.default = hotel.name
@@ -780,72 +936,44 @@ class HotelEditModal(discord.ui.Modal, title="宿泊情報を編集"):
         self.check_out.default = hotel.check_out.strftime("%Y-%m-%d %H:%M")
         self.address.default = hotel.address
 
-    hotel_name: discord.ui.TextInput[HotelEditModal] = discord.ui.TextInput(
-        label="宿泊施設名", placeholder="例: 札幌グランドホテル", required=True, max_length=100
-    )
-
-    hotel_type: discord.ui.TextInput[HotelEditModal] = discord.ui.TextInput(
-        label="宿泊タイプ",
-        placeholder="hotel/ryokan/airbnb/friends/other",
-        required=True,
-        max_length=20,
-    )
-
-    check_in: discord.ui.TextInput[HotelEditModal] = discord.ui.TextInput(
-        label="チェックイン日時", placeholder="例: 2025-07-01 15:00", required=True, max_length=20
-    )
-
-    check_out: discord.ui.TextInput[HotelEditModal] = discord.ui.TextInput(
-        label="チェックアウト日時", placeholder="例: 2025-07-03 11:00", required=True, max_length=20
-    )
-
-    address: discord.ui.TextInput[HotelEditModal] = discord.ui.TextInput(
-        label="住所", placeholder="例: 札幌市中央区北1条西4丁目", required=True, max_length=200
-    )
-
     async def on_submit(self, interaction: discord.Interaction) -> None:
         """送信時の処理."""
         try:
-            # 時刻をパース
-            check_in_dt = datetime.strptime(self.check_in.value, "%Y-%m-%d %H:%M")
-            check_out_dt = datetime.strptime(self.check_out.value, "%Y-%m-%d %H:%M")
-
-            # 宿泊タイプのバリデーション
-            valid_types = {"hotel", "ryokan", "airbnb", "friends", "other"}
-            hotel_type = self.hotel_type.value.lower()
-            if hotel_type not in valid_types:
-                raise ValueError(
-                    f"宿泊タイプは {', '.join(valid_types)} のいずれかを指定してください"
-                )
+            # モーダル表示中にクリア・再読み込みされている可能性があるため、最新の行程を取得する
+            user_id = str(interaction.user.id)
+            itinerary = await self.cog.get_itinerary(user_id)
+            hotel = _find_by_id(itinerary.accommodations, self.hotel_id) if itinerary else None
+            if itinerary is None or hotel is None:
+                await interaction.response.send_message(_MSG_EDIT_TARGET_GONE, ephemeral=True)
+                return
 
             # 宿泊情報を更新
-            self.hotel.name = self.hotel_name.value
-            self.hotel.type = hotel_type  # type: ignore[assignment]
-            self.hotel.check_in = check_in_dt
-            self.hotel.check_out = check_out_dt
-            self.hotel.address = self.address.value
+            for name, value in self._read_values().items():
+                setattr(hotel, name, value)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
-                f"✅ 宿泊施設 {self.hotel.name} を更新しました！", ephemeral=True
+                f"✅ 宿泊施設 {hotel.name} を更新しました！", ephemeral=True
             )
 
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error editing hotel: {e}")
+            logger.exception("Error editing hotel: %s", e)
             await interaction.response.send_message(
                 "❌ 宿泊情報の更新中にエラーが発生しました。", ephemeral=True
             )
 
 
-class MeetingEditModal(discord.ui.Modal, title="会議・イベント情報を編集"):
+class MeetingEditModal(_MeetingForm, title="会議・イベント情報を編集"):
     """会議情報編集用モーダル."""
 
     def __init__(self, cog: ScheduleCommands, meeting: Meeting):
         """初期化."""
         super().__init__()
         self.cog = cog
-        self.meeting = meeting
+        # 送信時に最新の旅行行程から引き直すため、項目はIDで保持する
+        self.meeting_id = meeting.id
 
         # 既存の値をセット
         self.meeting_title.default = meeting.title
@@ -854,59 +982,30 @@ class MeetingEditModal(discord.ui.Modal, title="会議・イベント情報を
         self.end_time.default = meeting.end_time.strftime("%Y-%m-%d %H:%M")
         self.attendees.default = ", ".join(meeting.attendees) if meeting.attendees else ""
 
-    meeting_title: discord.ui.TextInput[MeetingEditModal] = discord.ui.TextInput(
-        label="タイトル",
-        placeholder="例: プロジェクトキックオフ会議",
-        required=True,
-        max_length=100,
-    )
-
-    location: discord.ui.TextInput[MeetingEditModal] = discord.ui.TextInput(
-        label="場所", placeholder="例: 札幌オフィス 会議室A", required=True, max_length=100
-    )
-
-    start_time: discord.ui.TextInput[MeetingEditModal] = discord.ui.TextInput(
-        label="開始時刻", placeholder="例: 2025-07-02 10:00", required=True, max_length=20
-    )
-
-    end_time: discord.ui.TextInput[MeetingEditModal] = discord.ui.TextInput(
-        label="終了時刻", placeholder="例: 2025-07-02 12:00", required=True, max_length=20
-    )
-
-    attendees: discord.ui.TextInput[MeetingEditModal] = discord.ui.TextInput(
-        label="参加者（カンマ区切り）",
-        placeholder="例: 田中, 佐藤, 鈴木",
-        required=False,
-        max_length=200,
-    )
-
     async def on_submit(self, interaction: discord.Interaction) -> None:
         """送信時の処理."""
         try:
-            # 時刻をパース
-            start_dt = datetime.strptime(self.start_time.value, "%Y-%m-%d %H:%M")
-            end_dt = datetime.strptime(self.end_time.value, "%Y-%m-%d %H:%M")
-
-            # 参加者リストを作成
-            attendees_list = []
-            if self.attendees.value:
-                attendees_list = [a.strip() for a in self.attendees.value.split(",")]
+            # モーダル表示中にクリア・再読み込みされている可能性があるため、最新の行程を取得する
+            user_id = str(interaction.user.id)
+            itinerary = await self.cog.get_itinerary(user_id)
+            meeting = _find_by_id(itinerary.meetings, self.meeting_id) if itinerary else None
+            if itinerary is None or meeting is None:
+                await interaction.response.send_message(_MSG_EDIT_TARGET_GONE, ephemeral=True)
+                return
 
             # 会議情報を更新
-            self.meeting.title = self.meeting_title.value
-            self.meeting.location = self.location.value
-            self.meeting.start_time = start_dt
-            self.meeting.end_time = end_dt
-            self.meeting.attendees = attendees_list
+            for name, value in self._read_values().items():
+                setattr(meeting, name, value)
+            await self.cog.store_itinerary(user_id, itinerary)
 
             await interaction.response.send_message(
-                f"✅ 会議 「{self.meeting.title}」 を更新しました！", ephemeral=True
+                f"✅ 会議 「{meeting.title}」 を更新しました！", ephemeral=True
             )
 
         except ValueError as e:
             await interaction.response.send_message(f"❌ エラー: {e!s}", ephemeral=True)
         except Exception as e:
-            logger.error(f"Error editing meeting: {e}")
+            logger.exception("Error editing meeting: %s", e)
             await interaction.response.send_message(
                 "❌ 会議情報の更新中にエラーが発生しました。", ephemeral=True
             )
@@ -914,4 +1013,5 @@ class MeetingEditModal(discord.ui.Modal, title="会議・イベント情報を
 
 async def setup(bot: commands.Bot) -> None:
     """Cogをボットに追加."""
-    await bot.add_cog(ScheduleCommands(bot))
+    github_sync = await asyncio.to_thread(get_shared_github_sync)
+    await bot.add_cog(ScheduleCommands(bot, github_sync))
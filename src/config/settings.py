@@ -46,6 +46,35 @@ class Settings(BaseSettings):
     USER_DATA_PATH: str = Field(default="./data/user_data", description="ユーザーデータ保存パス")
     TEMPLATE_PATH: str = Field(default="./src/templates", description="テンプレート保存パス")
 
+    # キャッシュ設定
+    CHECKLIST_CACHE_SIZE: int = Field(
+        default=512, ge=1, description="メモリ上に保持するチェックリストの最大数"
+    )
+    CHECKLIST_CACHE_TTL: float = Field(
+        default=3600, gt=0, description="チェックリストをメモリ上に保持する秒数"
+    )
+    CHECKLIST_DISK_TTL: float = Field(
+        default=90 * 24 * 3600,
+        gt=0,
+        description="ディスク上のチェックリストを最終更新から保持する秒数",
+    )
+    ITINERARY_CACHE_SIZE: int = Field(
+        default=512, ge=1, description="メモリ上に保持する旅行行程の最大数"
+    )
+    ITINERARY_CACHE_TTL: float = Field(
+        default=7 * 24 * 3600,
+        gt=0,
+        description="旅行行程を最終更新から保持する秒数（メモリ・ディスクとも）",
+    )
+
+    # レート制限設定
+    SCHEDULE_RATE_LIMIT: int = Field(
+        default=10, ge=1, description="時間枠内にユーザーが実行できる/scheduleの回数"
+    )
+    SCHEDULE_RATE_WINDOW: float = Field(
+        default=60, gt=0, description="/scheduleのレート制限の時間枠（秒）"
+    )
+
     # 機能フラグ
     ENABLE_WEATHER_API: bool = Field(default=False, description="天気API機能の有効化")
     ENABLE_CLAUDE_API: bool = Field(default=False, description="Claude API機能の有効化")
@@ -6,8 +6,10 @@ GitHub integration for storing and retrieving checklist data.
 """
 
 import json
+import threading
 from datetime import datetime as dt
 from datetime import timedelta
+from operator import attrgetter
 from typing import Any
 from uuid import uuid4
 
@@ -33,6 +35,8 @@ class GitHubSync:
 
         self.github = Github(settings.GITHUB_TOKEN)
         self._repo: Repository | None = None
+        # 旅行一覧のキャッシュ: (走査時のブランチ先頭コミットSHA, ユーザーID -> 旅行リスト)
+        self._trips_cache: tuple[str, dict[str, list[dict[str, Any]]]] | None = None
 
     @property
     def repo(self) -> Repository:
@@ -102,6 +106,7 @@ class GitHubSync:
 
             # メタデータの保存
             self._save_metadata(checklist)
+            self._trips_cache = None
 
             # GitHub URLを返す
             return f"{settings.github_repo_url}/blob/{settings.GITHUB_BRANCH}/{file_path}"
@@ -125,7 +130,7 @@ class GitHubSync:
             "item_stats": {
                 "total": checklist.total_count,
                 "completed": checklist.completed_count,
-                "auto_added": sum(1 for item in checklist.items if item.auto_added),
+                "auto_added": sum(map(attrgetter("auto_added"), checklist.items)),
             },
         }
 
@@ -237,53 +242,75 @@ class GitHubSync:
             return None
 
     def get_user_trips(self, user_id: str, limit: int = 10) -> list[dict[str, Any]]:
-        """指定ユーザーの旅行リストを取得."""
+        """指定ユーザーの旅行リストを取得.
+
+        リポジトリ全体の走査は高コストなため、ブランチ先頭のコミットが前回の走査時から
+        変わっていなければ、走査結果のキャッシュを返す。
+        """
         if not settings.ENABLE_GITHUB_SYNC:
             logger.warning("GitHub sync is disabled")
             return []
 
-        trips = []
-
         try:
-            metadata_files = self._find_metadata_files("")  # 全メタデータファイルを取得
-
-            for metadata_file in metadata_files:
-                try:
-                    metadata = json.loads(metadata_file.decoded_content.decode("utf-8"))
-
-                    if metadata.get("user_id") == user_id:
-                        # ファイルパスから旅行情報を抽出
-                        path_parts = metadata_file.path.split("/")
-                        if len(path_parts) >= 4:  # trips/YYYY/MM/filename_metadata.json
-                            trip_info = {
-                                "checklist_id": metadata.get("checklist_id"),
-                                "year": path_parts[1],
-                                "month": path_parts[2],
-                                "filename": path_parts[3].replace("_metadata.json", ""),
-                                "status": metadata.get("status"),
-                                "created_at": metadata.get("created_at"),
-                                "updated_at": metadata.get("updated_at"),
-                                "completion_percentage": metadata.get("completion_percentage", 0),
-                                "github_url": (
-                                    f"{settings.github_repo_url}/blob/{settings.GITHUB_BRANCH}/"
-                                    f"{metadata_file.path.replace('_metadata.json', '.md')}"
-                                ),
-                            }
-                            trips.append(trip_info)
-
-                except Exception as e:
-                    logger.error(f"Failed to parse metadata file {metadata_file.path}: {e}")
-                    continue
-
-            # 更新日時でソート（新しい順）
-            trips.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+            head_sha = self._get_head_sha()
+            if self._trips_cache is not None and self._trips_cache[0] == head_sha:
+                trips_by_user = self._trips_cache[1]
+            else:
+                trips_by_user = self._scan_trips()
+                if head_sha is not None:
+                    self._trips_cache = (head_sha, trips_by_user)
 
-            return trips[:limit]
+            return trips_by_user.get(user_id, [])[:limit]
 
         except Exception as e:
             logger.error(f"Failed to get user trips: {e}")
             return []
 
+    def _get_head_sha(self) -> str | None:
+        """ブランチ先頭のコミットSHAを取得（取得できない場合はNone）."""
+        try:
+            return self.repo.get_branch(settings.GITHUB_BRANCH).commit.sha
+        except GithubException as e:
+            logger.warning(f"Failed to get branch head: {e}")
+            return None
+
+    def _scan_trips(self) -> dict[str, list[dict[str, Any]]]:
+        """全メタデータファイルを走査し、ユーザーごとの旅行リストを作成."""
+        trips_by_user: dict[str, list[dict[str, Any]]] = {}
+
+        for metadata_file in self._find_metadata_files(""):  # 全メタデータファイルを取得
+            try:
+                metadata = json.loads(metadata_file.decoded_content.decode("utf-8"))
+
+                # ファイルパスから旅行情報を抽出
+                path_parts = metadata_file.path.split("/")
+                if len(path_parts) >= 4:  # trips/YYYY/MM/filename_metadata.json
+                    trip_info = {
+                        "checklist_id": metadata.get("checklist_id"),
+                        "year": path_parts[1],
+                        "month": path_parts[2],
+                        "filename": path_parts[3].replace("_metadata.json", ""),
+                        "status": metadata.get("status"),
+                        "created_at": metadata.get("created_at"),
+                        "updated_at": metadata.get("updated_at"),
+                        "completion_percentage": metadata.get("completion_percentage", 0),
+                        "github_url": (
+                            f"{settings.github_repo_url}/blob/{settings.GITHUB_BRANCH}/"
+                            f"{metadata_file.path.replace('_metadata.json', '.md')}"
+                        ),
+                    }
+                    trips_by_user.setdefault(metadata.get("user_id"), []).append(trip_info)
+
+            except Exception as e:
+                logger.error(f"Failed to parse metadata file {metadata_file.path}: {e}")
+                continue
+
+        # 更新日時でソート（新しい順）
+        for trips in trips_by_user.values():
+            trips.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+
+        return trips_by_user
+
     def delete_checklist(self, checklist_id: str, user_id: str) -> bool:
         """チェックリストを削除."""
         if not settings.ENABLE_GITHUB_SYNC:
@@ -329,6 +356,7 @@ class GitHubSync:
                     except GithubException:
                         logger.warning(f"Markdown file not found: {markdown_path}")
 
+                    self._trips_cache = None
                     logger.info(f"Deleted checklist: {checklist_id}")
                     return True
 
@@ -583,3 +611,22 @@ updated_at: "{itinerary.updated_at.isoformat()}"
 
 """
         return front_matter + itinerary.to_markdown()
+
+
+_shared_sync: GitHubSync | None = None
+_shared_sync_lock = threading.Lock()
+
+
+def get_shared_github_sync() -> GitHubSync:
+    """Cog間で共有するGitHubSyncインスタンスを取得（初回呼び出し時に作成）.
+
+    複数のCogのセットアップから別スレッドで同時に呼ばれても、作成は一度だけ行う。
+
+    Raises:
+        GitHubSyncError: GitHub Tokenが設定されていない場合
+    """
+    global _shared_sync  # noqa: PLW0603
+    with _shared_sync_lock:
+        if _shared_sync is None:
+            _shared_sync = GitHubSync()
+        return _shared_sync
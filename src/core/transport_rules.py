@@ -23,6 +23,7 @@ class TransportRulesLoader:
         """初期化."""
         self.rules_file = Path(__file__).parent.parent / "data" / "transport_rules.yaml"
         self._rules_cache: dict[str, Any] | None = None
+        self._recommendations_cache: dict[str, list[str]] = {}
         logger.info(f"TransportRulesLoader initialized with rules file: {self.rules_file}")
 
     def load_rules(self) -> dict[str, Any]:
@@ -314,6 +315,10 @@ class TransportRulesLoader:
 
     def get_recommendations(self, transport_method: TransportMethod) -> list[str]:
         """交通手段別の推奨事項を取得."""
+        cached = self._recommendations_cache.get(transport_method)
+        if cached is not None:
+            return list(cached)
+
         rules = self.load_rules()
         transport_rules = rules.get("transport_methods", {})
         general_recs = rules.get("general_recommendations", {})
@@ -343,4 +348,5 @@ class TransportRulesLoader:
                 highway = method_rules.get("highway_bus", {})
                 recommendations.extend(highway.get("recommendations", []))
 
-        return recommendations
+        self._recommendations_cache[transport_method] = recommendations
+        return list(recommendations)
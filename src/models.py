@@ -6,10 +6,11 @@ Python 3.12+の新しい型構文を使用します。
 """
 
 from datetime import date, datetime, timedelta
-from typing import Any, Literal, TypedDict
+from operator import attrgetter
+from typing import Any, ClassVar, Literal, TypedDict
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, computed_field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_validator
 
 # Type aliases using Python 3.12+ syntax
 type ChecklistId = str
@@ -26,6 +27,10 @@ type FlightStatus = Literal["scheduled", "delayed", "cancelled", "arrived"]
 type AccommodationType = Literal["hotel", "ryokan", "airbnb", "friends", "other"]
 
 
+# チェック状態の取得（C実装のattrgetterで集計ループを高速化）
+_get_checked = attrgetter("checked")
+
+
 # TypedDict definitions
 class ChecklistItemDict(TypedDict):
     """チェックリストアイテムの辞書表現."""
@@ -114,6 +119,15 @@ class ChecklistItem(BaseModel):
     reason: str | None = Field(default=None, description="自動追加の理由")
     item_id: str = Field(default_factory=lambda: str(uuid4()), description="項目の一意ID")
 
+    # いずれかの項目のチェック状態が変更された回数（完了数キャッシュの無効化に使用）
+    check_version: ClassVar[int] = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """チェック状態の変更を記録してから属性を設定."""
+        if name == "checked":
+            ChecklistItem.check_version += 1
+        super().__setattr__(name, value)
+
     def __str__(self) -> str:
         """項目の文字列表現."""
         check_mark = "☑️" if self.checked else "⬜"
@@ -168,15 +182,16 @@ class TripChecklist(BaseModel):
     template_used: TemplateType | None = Field(default=None, description="使用したテンプレート")
     weather_data: WeatherDataDict | None = Field(default=None, description="天気予報データ")
 
+    # (チェック状態の変更回数, 更新日時, 項目数) -> 完了済みアイテム数
+    _completed_cache: tuple[tuple[int, datetime, int], int] | None = PrivateAttr(default=None)
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def items_by_category(self) -> dict[ItemCategory, list[ChecklistItem]]:
         """カテゴリ別にアイテムを整理."""
         result: dict[ItemCategory, list[ChecklistItem]] = {}
         for item in self.items:
-            if item.category not in result:
-                result[item.category] = []
-            result[item.category].append(item)
+            result.setdefault(item.category, []).append(item)
         return result
 
     @computed_field  # type: ignore[prop-decorator]
@@ -185,14 +200,22 @@ class TripChecklist(BaseModel):
         """完了率を計算."""
         if not self.items:
             return 0.0
-        checked_count = sum(1 for item in self.items if item.checked)
-        return (checked_count / len(self.items)) * 100
+        return (self.completed_count / len(self.items)) * 100
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def completed_count(self) -> int:
-        """完了済みアイテム数."""
-        return sum(1 for item in self.items if item.checked)
+        """完了済みアイテム数.
+
+        チェック状態・項目の追加削除・更新日時のいずれも変わっていなければ、前回の集計結果を返す。
+        """
+        key = (ChecklistItem.check_version, self.updated_at, len(self.items))
+        cached = self._completed_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        count = sum(map(_get_checked, self.items))
+        self._completed_cache = (key, count)
+        return count
 
     @computed_field  # type: ignore[prop-decorator]
     @property
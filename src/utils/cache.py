@@ -0,0 +1,118 @@
+"""
+In-memory cache utilities.
+
+サイズ上限付きのLRUキャッシュを提供します。
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, ItemsView, Iterator, MutableMapping, ValuesView
+
+
+class LRUCache[K, V](MutableMapping[K, V]):
+    """最大件数を超えると最も古く参照された要素から破棄するdict互換のキャッシュ.
+
+    ttlを指定すると、登録から指定秒数が経過した要素も破棄する。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        on_evict: Callable[[K, V], None] | None = None,
+        *,
+        ttl: float | None = None,
+    ) -> None:
+        """初期化.
+
+        Args:
+            maxsize: 保持する最大件数
+            on_evict: 上限超過または期限切れで要素が破棄されたときに呼ばれるコールバック
+            ttl: 要素の有効期間（秒）。Noneの場合は期限なし
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: OrderedDict[K, V] = OrderedDict()
+        # 有効期限（登録順 = 期限の早い順に並ぶ）
+        self._expires: dict[K, float] = {}
+
+    def __getitem__(self, key: K) -> V:
+        """要素を取得し、最近使用したものとして扱う."""
+        value = self._data[key]
+        if self._is_expired(key):
+            self._evict(key)
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """要素を追加し、期限切れの要素と上限を超えた分を古い順に破棄."""
+        self.expire()
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.ttl is not None:
+            # 再登録時は末尾に付け直し、期限順を保つ
+            self._expires.pop(key, None)
+            self._expires[key] = time.monotonic() + self.ttl
+        while len(self._data) > self.maxsize:
+            self._evict(next(iter(self._data)))
+
+    def __delitem__(self, key: K) -> None:
+        """要素を削除."""
+        del self._data[key]
+        self._expires.pop(key, None)
+
+    def __iter__(self) -> Iterator[K]:
+        """古い順にキーを返す."""
+        self.expire()
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """要素数."""
+        self.expire()
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        """参照順を変えずに存在確認."""
+        return key in self._data and not self._is_expired(key)  # type: ignore[arg-type]
+
+    def values(self) -> ValuesView[V]:
+        """参照順を変えずに値を返す（走査中の並べ替えを避ける）."""
+        self.expire()
+        return self._data.values()
+
+    def items(self) -> ItemsView[K, V]:
+        """参照順を変えずにキーと値を返す."""
+        self.expire()
+        return self._data.items()
+
+    def expire(self) -> None:
+        """期限切れの要素を破棄."""
+        if not self._expires:
+            return
+        now = time.monotonic()
+        while self._expires:
+            key, expires_at = next(iter(self._expires.items()))
+            if expires_at > now:
+                break
+            self._evict(key)
+
+    def _is_expired(self, key: K) -> bool:
+        """要素が期限切れか."""
+        expires_at = self._expires.get(key)
+        return expires_at is not None and expires_at <= time.monotonic()
+
+    def _evict(self, key: K) -> None:
+        """要素を破棄し、コールバックに通知."""
+        value = self._data.pop(key)
+        self._expires.pop(key, None)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __repr__(self) -> str:
+        """デバッグ用の表現."""
+        return f"{type(self).__name__}(maxsize={self.maxsize}, size={len(self._data)})"
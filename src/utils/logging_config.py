@@ -38,6 +38,8 @@ def setup_logging(
 
     # structlogの設定
     processors: list[Any] = [
+        # 無効なレベルのログは以降の処理（引数の埋め込み等）を行わずに破棄する
+        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -61,6 +63,8 @@ def setup_logging(
         processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
+        # 位置引数を保持したままプロセッサへ渡し、出力するログだけを整形する
+        wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
 
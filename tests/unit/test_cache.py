@@ -0,0 +1,90 @@
+"""
+Unit tests for cache utilities.
+"""
+
+import pytest
+
+from src.utils import cache as cache_module
+from src.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test LRUCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest entry is evicted when full."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1  # "a" を最近使用したものにする
+
+        cache["c"] = 3
+
+        assert "b" not in cache
+        assert list(cache) == ["a", "c"]
+
+    def test_on_evict_called(self):
+        """Test that the eviction callback receives the evicted entry."""
+        evicted: list[tuple[str, int]] = []
+        cache: LRUCache[str, int] = LRUCache(
+            maxsize=1, on_evict=lambda k, v: evicted.append((k, v))
+        )
+        cache["a"] = 1
+        cache["a"] = 2  # 同じキーの上書きは破棄ではない
+        cache["b"] = 3
+
+        assert evicted == [("a", 2)]
+
+    def test_get_returns_default(self):
+        """Test dict-compatible get."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+
+        assert cache.get("missing") is None
+        assert cache.get("missing", 0) == 0
+
+    def test_values_do_not_reorder(self):
+        """Test that iterating values keeps the recency order."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=3)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        assert list(cache.values()) == [1, 2]
+        assert list(cache.items()) == [("a", 1), ("b", 2)]
+        assert list(cache) == ["a", "b"]
+
+    def test_delete(self):
+        """Test deleting entries."""
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache["a"] = 1
+        del cache["a"]
+
+        assert len(cache) == 0
+
+    def test_invalid_maxsize(self):
+        """Test that a non-positive maxsize is rejected."""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test that entries expire after the TTL and trigger the callback."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        evicted: list[str] = []
+        cache: LRUCache[str, int] = LRUCache(
+            maxsize=10, on_evict=lambda k, v: evicted.append(k), ttl=60
+        )
+        cache["a"] = 1
+        now[0] += 30
+        cache["b"] = 2
+        assert cache["a"] == 1  # 参照しても期限は延びない
+
+        now[0] += 31
+        assert "a" not in cache
+        assert cache.get("a") is None
+        assert list(cache) == ["b"]
+        assert evicted == ["a"]
+
+    def test_invalid_ttl(self):
+        """Test that a non-positive TTL is rejected."""
+        with pytest.raises(ValueError):
+            LRUCache(ttl=0)
@@ -193,9 +193,35 @@ class TestChecklistCheckView:
 
         # Verify all items in category are checked
         assert all(item.checked for item in view.items)
+        assert view.progress == (1, 1)
         mock_interaction.response.edit_message.assert_called_once()
         mock_interaction.followup.send.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_progress_consistent_across_views(
+        self, sample_checklist, mock_interaction, event_loop
+    ):
+        """Test two views open on the same checklist report the same progress."""
+        asyncio.set_event_loop(event_loop)
+        mock_cog = MagicMock()
+        mock_cog.checklists = {sample_checklist.id: sample_checklist}
+        view = ChecklistCheckView(sample_checklist, cog=mock_cog)
+        first = ItemCheckView(sample_checklist, "生活用品", mock_cog)
+        second = ItemCheckView(sample_checklist, "生活用品", mock_cog)
+
+        for item_view in (first, second):
+            uncheck_all_button = next(
+                child
+                for child in item_view.children
+                if isinstance(child, discord.ui.Button) and child.custom_id == "uncheck_all"
+            )
+            await uncheck_all_button.callback(mock_interaction)
+
+        # Counts are derived from the shared items, so they never drift below zero
+        assert first.progress == second.progress == (0, 2)
+        category_field = next(f for f in view.get_embed().fields if "カテゴリ別" in f.name)
+        assert "生活用品: 0/2" in category_field.value
+
     @pytest.mark.asyncio
     async def test_pagination_buttons(self, sample_checklist, event_loop):
         """Test pagination button state updates."""
@@ -327,6 +353,30 @@ class TestItemCheckView:
         # Verify all items are unchecked
         assert all(not item.checked for item in view.items)
         mock_interaction.response.edit_message.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_select_menu_refreshed_in_place(
+        self, sample_checklist, mock_interaction, event_loop
+    ):
+        """Test that the select menu is reused and its options are refreshed."""
+        asyncio.set_event_loop(event_loop)
+        mock_cog = MagicMock()
+        mock_cog.checklists = {sample_checklist.id: sample_checklist}
+        view = ItemCheckView(sample_checklist, "生活用品", mock_cog)
+        select_menu = view.select_menu
+
+        uncheck_all_button = next(
+            child
+            for child in view.children
+            if isinstance(child, discord.ui.Button) and child.custom_id == "uncheck_all"
+        )
+        await uncheck_all_button.callback(mock_interaction)
+
+        # 同じセレクトメニューが使われ、ボタンも残っている
+        assert view.select_menu is select_menu
+        assert select_menu in view.children
+        assert len([c for c in view.children if isinstance(c, discord.ui.Button)]) == 4
+        assert all(str(option.emoji) == "⬜" for option in select_menu.options)
         mock_interaction.followup.send.assert_called_once()
 
     @pytest.mark.asyncio
@@ -0,0 +1,151 @@
+"""
+Unit tests for checklist detail view.
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.bot.checklist_detail import (
+    ChecklistDetailView,
+    _paginate_lines,
+    create_detailed_checklist_text,
+    get_detailed_checklist,
+)
+from src.models import ChecklistItem, TripChecklist
+
+
+@pytest.fixture
+def sample_checklist():
+    """Sample checklist for testing."""
+    return TripChecklist(
+        id="detail-001",
+        destination="札幌",
+        start_date=date(2025, 8, 1),
+        end_date=date(2025, 8, 3),
+        purpose="leisure",
+        user_id="123456789",
+        items=[
+            ChecklistItem(name="財布", category="移動関連", checked=True),
+            ChecklistItem(
+                name="折り畳み傘",
+                category="天気対応",
+                checked=False,
+                auto_added=True,
+                reason="降水確率50%",
+            ),
+        ],
+    )
+
+
+class TestGetDetailedChecklist:
+    """Test detail text caching."""
+
+    def test_returns_lines(self, sample_checklist):
+        """Test that the cached lines match the rendered text."""
+        lines = get_detailed_checklist(sample_checklist)
+
+        assert "\n".join(lines) == create_detailed_checklist_text(sample_checklist)
+
+    def test_cache_hit_for_same_version(self, sample_checklist):
+        """Test that an unchanged checklist reuses the cached result."""
+        first = get_detailed_checklist(sample_checklist)
+        second = get_detailed_checklist(sample_checklist)
+
+        assert first is second
+
+    def test_cache_invalidated_on_update(self, sample_checklist):
+        """Test that toggling an item renders fresh text."""
+        lines = get_detailed_checklist(sample_checklist)
+
+        sample_checklist.items[1].checked = True
+        sample_checklist.updated_at = datetime.now() + timedelta(seconds=1)
+        new_lines = get_detailed_checklist(sample_checklist)
+
+        assert new_lines != lines
+        assert "✅ 折り畳み傘" in new_lines
+
+
+class TestChecklistDetailView:
+    """Test ChecklistDetailView class."""
+
+    @pytest.mark.asyncio
+    async def test_checklist_data_joined_lazily(self):
+        """Test that the full text is only joined on demand."""
+        view = ChecklistDetailView(("# 見出し", "", "✅ 財布"))
+
+        assert view._checklist_data is None
+        assert view.checklist_data == "# 見出し\n\n✅ 財布"
+        assert view.total_pages == 1
+
+    @pytest.mark.asyncio
+    async def test_total_pages(self):
+        """Test page count calculation."""
+        assert ChecklistDetailView(tuple(str(i) for i in range(40))).total_pages == 1
+        assert ChecklistDetailView(("あ" * 3000, "い" * 3000)).total_pages == 2
+        assert ChecklistDetailView(()).total_pages == 1
+
+    @pytest.mark.asyncio
+    async def test_pages_precomputed(self):
+        """Test that page contents are built once up front."""
+        lines = tuple(f"{i:03d}" + "x" * 96 for i in range(50))  # 100文字 x 50行
+        view = ChecklistDetailView(lines)
+
+        assert view.total_pages == 2
+        assert all(len(page) <= 3900 for page in view.pages)
+        assert "\n".join(view.pages) == "\n".join(lines)
+
+        view.current_page = 1
+        assert view.get_page_content() == view.pages[1]
+
+    @pytest.mark.asyncio
+    async def test_build_all_page_batches_respects_message_limit(self):
+        """Test that every page is batched and each batch fits in one message."""
+        short_view = ChecklistDetailView(tuple("x" * 2000 for _ in range(2)))
+        assert [len(batch) for batch in short_view.build_all_page_batches()] == [2]
+
+        long_view = ChecklistDetailView(tuple("x" * 3000 for _ in range(5)))
+        batches = long_view.build_all_page_batches()
+        assert sum(len(batch) for batch in batches) == long_view.total_pages
+        for batch in batches:
+            assert len(batch) <= 10
+            assert sum(len(embed) for embed in batch) <= 6000
+
+    @pytest.mark.asyncio
+    async def test_show_all_pages_sends_every_page(self, sample_checklist):
+        """Test that a multi-page checklist is sent in full across followups."""
+        for i in range(150):
+            sample_checklist.add_item(
+                ChecklistItem(name=f"アイテム{i:03d}" + "x" * 40, category="生活用品")
+            )
+        view = ChecklistDetailView(get_detailed_checklist(sample_checklist))
+        assert view.total_pages > 1
+        interaction = AsyncMock()
+
+        await view.show_all_pages.callback(interaction)
+
+        sent = interaction.response.send_message.call_args_list + (
+            interaction.followup.send.call_args_list
+        )
+        assert interaction.followup.send.call_count >= 1
+        titles = [embed.title for call in sent for embed in call.kwargs["embeds"]]
+        assert titles == [
+            f"📋 チェックリスト詳細 (ページ {i}/{view.total_pages})"
+            for i in range(1, view.total_pages + 1)
+        ]
+        for call in sent:
+            assert call.kwargs["ephemeral"] is True
+            assert sum(len(embed) for embed in call.kwargs["embeds"]) <= 6000
+
+
+class TestPaginateLines:
+    """Test character-budget pagination."""
+
+    def test_packs_lines_under_budget(self):
+        """Test that lines are packed greedily."""
+        assert _paginate_lines(["ab", "cd", "ef"], budget=5) == ["ab\ncd", "ef"]
+
+    def test_splits_overlong_line(self):
+        """Test that a single line longer than the budget is split."""
+        assert _paginate_lines(["abcdefghijk"], budget=5) == ["abcde", "fghij", "k"]
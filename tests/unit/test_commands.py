@@ -2,14 +2,32 @@
 Unit tests for Discord bot commands.
 """
 
-from datetime import date
+import asyncio
+import os
+import threading
+import time
+from datetime import date, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
 import pytest
 
-from src.bot.commands import TripCommands
-from src.models import ChecklistItem, TripChecklist, TripRequest
+from src.bot.commands import (
+    ChecklistButton,
+    ChecklistView,
+    TripCommands,
+    _normalize_trip,
+    _parse_ymd,
+)
+from src.config.settings import settings
+from src.models import ChecklistItem, GitHubSyncError, TripChecklist, TripRequest
+
+
+@pytest.fixture(autouse=True)
+def user_data_path(tmp_path, monkeypatch):
+    """Redirect the user data directory so TripCommands never writes into the working tree."""
+    monkeypatch.setattr(settings, "USER_DATA_PATH", str(tmp_path))
+    return tmp_path
 
 
 @pytest.fixture
@@ -250,3 +268,334 @@ class TestTripCommands:
         progress_field = next((f for f in embed.fields if "進捗" in f.name), None)
         assert progress_field is not None
         assert "33.33%" in progress_field.value
+
+    def test_create_checklist_embed_truncates_categories(self, mock_bot, sample_checklist):
+        """Test that only the first three categories get their own field."""
+        cog = TripCommands(mock_bot)
+        sample_checklist.add_item(ChecklistItem(name="名刺", category="仕事関連"))
+
+        embed = cog.create_checklist_embed(sample_checklist)
+
+        names = [field.name for field in embed.fields]
+        assert names[:3] == ["📋 移動関連", "📋 生活用品", "📋 天気対応"]
+        assert names[3] == "..."
+        assert embed.fields[3].value == "他 1 カテゴリ"
+        assert names[4] == "📊 進捗"
+
+    def test_create_checklist_embed_cached(self, mock_bot, sample_checklist):
+        """Test that the embed is reused until the checklist changes."""
+        cog = TripCommands(mock_bot)
+
+        with patch.object(cog, "_build_checklist_embed", wraps=cog._build_checklist_embed) as build:
+            first = cog.create_checklist_embed(sample_checklist)
+            second = cog.create_checklist_embed(sample_checklist)
+            assert build.call_count == 1
+            assert first is second
+
+            sample_checklist.toggle_item(sample_checklist.items[0].item_id)
+            updated = cog.create_checklist_embed(sample_checklist)
+            assert build.call_count == 2
+            assert updated is not first
+
+        progress_field = next(f for f in updated.fields if "進捗" in f.name)
+        assert "66.67%" in progress_field.value
+
+
+class TestChecklistCache:
+    """Test checklist caching on TripCommands."""
+
+    @pytest.fixture
+    def cog(self, mock_bot):
+        """TripCommands backed by the per-test user data directory."""
+        return TripCommands(mock_bot)
+
+    def test_store_and_get_from_memory(self, cog, sample_checklist):
+        """Test that stored checklists are served from memory."""
+        cog.store_checklist(sample_checklist)
+
+        assert cog.get_checklist(sample_checklist.id) is sample_checklist
+        assert not (cog.checklist_cache_dir / f"{sample_checklist.id}.json").exists()
+
+    def test_persisted_checklist_survives_restart(self, mock_bot, cog, sample_checklist):
+        """Test that a persisted checklist is reloaded from disk on a cache miss."""
+        cog.store_checklist(sample_checklist, persist=True)
+
+        new_cog = TripCommands(mock_bot)
+        loaded = new_cog.get_checklist(sample_checklist.id)
+
+        assert loaded is not None
+        assert loaded.id == sample_checklist.id
+        assert loaded.completed_count == sample_checklist.completed_count
+        assert new_cog.checklists[sample_checklist.id] is loaded
+
+    def test_get_missing_checklist(self, cog):
+        """Test that an unknown ID returns None."""
+        assert cog.get_checklist("missing") is None
+
+    @pytest.mark.parametrize("checklist_id", ["../../x", "a/b", "..", "x.json", ""])
+    def test_invalid_id_never_touches_disk(self, cog, tmp_path, checklist_id):
+        """Test that IDs which could escape the cache directory are rejected."""
+        (tmp_path / "x.json").write_text("{}", encoding="utf-8")
+
+        assert cog._checklist_path(checklist_id) is None
+        assert cog.get_checklist(checklist_id) is None
+
+    @pytest.mark.asyncio
+    async def test_persist_batched_off_event_loop(self, cog, sample_checklist, monkeypatch):
+        """Test that repeated persists on the event loop are written once in a thread."""
+        monkeypatch.setattr("src.bot.commands._PERSIST_DELAY", 0)
+        writes = []
+        monkeypatch.setattr(cog, "_write_checklists", writes.append)
+
+        cog.store_checklist(sample_checklist, persist=True)
+        sample_checklist.items[0].checked = True
+        cog.store_checklist(sample_checklist, persist=True)
+        assert writes == []  # イベントループ上では即座に書き出さない
+
+        await cog._flush_task
+        assert len(writes) == 1
+        [(checklist_id, data)] = writes[0]
+        assert checklist_id == sample_checklist.id
+        assert TripChecklist.model_validate_json(data).items[0].checked is True
+
+    @pytest.mark.asyncio
+    async def test_persist_during_flush_is_written(self, cog, sample_checklist, monkeypatch):
+        """Test that a checklist queued while a flush is writing is flushed too."""
+        monkeypatch.setattr("src.bot.commands._PERSIST_DELAY", 0)
+        release = threading.Event()
+        write_checklists = cog._write_checklists
+
+        def slow_write(payloads):
+            release.wait(timeout=5)
+            write_checklists(payloads)
+
+        monkeypatch.setattr(cog, "_write_checklists", slow_write)
+        cog.store_checklist(sample_checklist, persist=True)
+        flush_task = cog._flush_task
+        while cog._pending_writes:  # 1回目の書き込みが別スレッドで始まるまで待つ
+            await asyncio.sleep(0)
+
+        other = sample_checklist.model_copy(update={"id": "test-002"})
+        cog.store_checklist(other, persist=True)
+        assert cog._flush_task is flush_task  # 書き込み中のタスクが引き継ぐ
+
+        release.set()
+        await flush_task
+
+        for checklist in (sample_checklist, other):
+            assert (cog.checklist_cache_dir / f"{checklist.id}.json").is_file()
+        assert not cog._pending_writes
+
+    def test_stale_files_purged_on_startup(self, mock_bot, cog, sample_checklist, monkeypatch):
+        """Test that checklist files older than the retention period are deleted."""
+        cog.store_checklist(sample_checklist, persist=True)
+        path = cog.checklist_cache_dir / f"{sample_checklist.id}.json"
+        stale = time.time() - settings.CHECKLIST_DISK_TTL - 1
+        os.utime(path, (stale, stale))
+
+        TripCommands(mock_bot)
+
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_load_remote_checklist(self, mock_bot, sample_checklist):
+        """Test that a checklist missing locally is loaded from GitHub and cached."""
+        github_sync = MagicMock()
+        github_sync.load_checklist.return_value = sample_checklist
+        cog = TripCommands(mock_bot, github_sync=github_sync)
+
+        loaded = await cog.load_remote_checklist(sample_checklist.id, sample_checklist.user_id)
+
+        assert loaded is sample_checklist
+        github_sync.load_checklist.assert_called_once_with(
+            sample_checklist.id, sample_checklist.user_id
+        )
+        assert cog.get_checklist(sample_checklist.id) is sample_checklist
+
+    @pytest.mark.asyncio
+    async def test_load_remote_checklist_error(self, mock_bot):
+        """Test that GitHub errors are reported as a missing checklist."""
+        github_sync = MagicMock()
+        github_sync.load_checklist.side_effect = GitHubSyncError("boom")
+        cog = TripCommands(mock_bot, github_sync=github_sync)
+
+        assert await cog.load_remote_checklist("missing", "987654321") is None
+
+    @pytest.mark.asyncio
+    async def test_latest_checklist_uses_user_index(self, cog, sample_checklist):
+        """Test that the per-user index picks the newest checklist of that user."""
+        older = sample_checklist.model_copy(
+            update={"id": "test-000", "created_at": datetime(2025, 1, 1)}
+        )
+        other_user = sample_checklist.model_copy(update={"id": "test-999", "user_id": "other"})
+        for checklist in (sample_checklist, older, other_user):
+            cog.store_checklist(checklist)
+
+        latest = await cog._get_checklist_for_reschedule(sample_checklist.user_id, None)
+        assert latest is sample_checklist
+
+        cog.checklists.maxsize = 1
+        cog.store_checklist(other_user)  # 保存されていないチェックリストは破棄で失われる
+        assert await cog._get_checklist_for_reschedule(sample_checklist.user_id, None) is None
+
+    @pytest.mark.asyncio
+    async def test_latest_checklist_reloaded_after_eviction(
+        self, mock_bot, cog, sample_checklist, monkeypatch
+    ):
+        """Test that the latest persisted checklist is found after memory eviction or restart."""
+        monkeypatch.setattr("src.bot.commands._PERSIST_DELAY", 0)
+        older = sample_checklist.model_copy(
+            update={"id": "test-000", "created_at": datetime(2025, 1, 1)}
+        )
+        other_user = sample_checklist.model_copy(update={"id": "test-999", "user_id": "other"})
+        for checklist in (sample_checklist, older, other_user):
+            cog.store_checklist(checklist, persist=True)
+        await cog._flush_task
+
+        cog.checklists.clear()  # 有効期限切れでメモリから破棄された状態
+        latest = await cog._get_checklist_for_reschedule(sample_checklist.user_id, None)
+        assert latest is not None
+        assert latest.id == sample_checklist.id
+
+        restarted = TripCommands(mock_bot)
+        latest = await restarted._get_checklist_for_reschedule(sample_checklist.user_id, None)
+        assert latest is not None
+        assert latest.id == sample_checklist.id
+        assert restarted.get_checklist(sample_checklist.id) is latest
+
+    def test_reschedule_persists_adjusted_checklist(self, mock_bot, cog, sample_checklist):
+        """Test that rescheduling persists the checklist after duration adjustments."""
+        cog.store_checklist(sample_checklist)
+
+        result = cog._execute_reschedule(sample_checklist, date(2025, 7, 10), date(2025, 7, 14))
+
+        assert "4泊" in result["description"]
+        loaded = TripCommands(mock_bot).get_checklist(sample_checklist.id)
+        assert loaded is not None
+        assert loaded.end_date == date(2025, 7, 14)
+        assert any(item.name == "洗濯用洗剤（小分け）" for item in loaded.items)
+
+
+class TestTripHistory:
+    """Test /trip_history."""
+
+    @pytest.mark.asyncio
+    async def test_errors_stay_private(self, mock_bot, mock_interaction):
+        """Test that guard errors are sent as ephemeral responses without deferring."""
+        cog = TripCommands(mock_bot)
+        cog._github_enabled = False
+
+        await cog.trip_history.callback(cog, mock_interaction)
+
+        mock_interaction.response.send_message.assert_called_once_with(
+            "GitHub同期機能は無効になっています。", ephemeral=True
+        )
+        mock_interaction.response.defer.assert_not_called()
+        mock_interaction.followup.send.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_history_is_public(self, mock_bot, mock_interaction):
+        """Test that the history itself is sent as a public response."""
+        github_sync = MagicMock()
+        github_sync.get_user_trips.return_value = []
+        cog = TripCommands(mock_bot, github_sync=github_sync)
+        cog._github_enabled = True
+
+        await cog.trip_history.callback(cog, mock_interaction)
+
+        mock_interaction.response.defer.assert_called_once_with()
+        mock_interaction.followup.send.assert_called_once()
+        assert "ephemeral" not in mock_interaction.followup.send.call_args.kwargs
+
+
+class TestChecklistView:
+    """Test persistent checklist buttons."""
+
+    @pytest.mark.asyncio
+    async def test_buttons_encode_checklist_id(self):
+        """Test that every button carries the checklist ID in its custom_id."""
+        view = ChecklistView("test-001")
+
+        assert view.timeout is None
+        assert [item.custom_id for item in view.children] == [
+            "checklist:check:test-001",
+            "checklist:details:test-001",
+            "checklist:save:test-001",
+            "checklist:reschedule:test-001",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_button_restored_from_custom_id(self, mock_interaction):
+        """Test that a button is rebuilt from its custom_id after a restart."""
+        pattern = ChecklistButton.__discord_ui_compiled_template__
+        match = pattern.fullmatch("checklist:save:test-001")
+        assert match is not None
+
+        button = await ChecklistButton.from_custom_id(mock_interaction, MagicMock(), match)
+
+        assert button.action == "save"
+        assert button.checklist_id == "test-001"
+        assert pattern.fullmatch("checklist:delete:test-001") is None
+
+    @pytest.mark.asyncio
+    async def test_missing_checklist_skips_handler(self, mock_bot, mock_interaction):
+        """Test that a button for an unknown checklist replies with the shared error."""
+        cog = TripCommands(mock_bot)
+        mock_interaction.response.is_done = MagicMock(return_value=False)
+
+        with patch("src.bot.commands.ChecklistCheckView") as mock_view:
+            await ChecklistButton("check", "missing").check_items(mock_interaction, cog)
+
+        mock_view.assert_not_called()
+        mock_interaction.response.send_message.assert_called_once_with(
+            ephemeral=True, content="チェックリストが見つかりませんでした。"
+        )
+
+
+class TestParseYmd:
+    """Test YYYY-MM-DD date parsing."""
+
+    def test_valid_date(self):
+        """Test that a well-formed date is parsed."""
+        assert _parse_ymd("2025-07-10") == date(2025, 7, 10)
+
+    @pytest.mark.parametrize("value", ["2025/07/10", "20250710", "2025-7-10", "2025-02-30", ""])
+    def test_invalid_date(self, value):
+        """Test that malformed or nonexistent dates raise ValueError."""
+        with pytest.raises(ValueError):
+            _parse_ymd(value)
+
+
+class TestNormalizeTrip:
+    """Test trip history row normalization."""
+
+    def test_defaults_for_missing_fields(self):
+        """Test that missing status, progress and update time fall back to defaults."""
+        row = _normalize_trip(
+            {
+                "checklist_id": "test-001",
+                "filename": "2025-07-10-sapporo.md",
+                "github_url": "https://github.com/example/repo/blob/main/trip.md",
+            }
+        )
+
+        assert row.status_emoji == "📝"
+        assert row.completion == "0.0%"
+        assert row.updated == "不明"
+
+    def test_formats_values(self):
+        """Test that progress and update time are formatted once."""
+        row = _normalize_trip(
+            {
+                "checklist_id": "test-001",
+                "filename": "2025-07-10-sapporo.md",
+                "status": "unknown",
+                "completion_percentage": 42.345,
+                "updated_at": "2025-07-01T12:00:00",
+                "github_url": "https://github.com/example/repo/blob/main/trip.md",
+            }
+        )
+
+        assert row.status_emoji == "📋"
+        assert row.completion == "42.3%"
+        assert row.updated == "2025-07-01"
@@ -8,7 +8,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from github import GithubException
 
-from src.core.github_sync import GitHubSync
+from src.core import github_sync
+from src.core.github_sync import GitHubSync, get_shared_github_sync
 from src.models import (
     ChecklistItem,
     GitHubSyncError,
@@ -214,6 +215,33 @@ class TestGitHubSync:
         assert trips[0]["month"] == "06"
         assert trips[0]["filename"] == "20250628-札幌-business"
 
+    def test_get_user_trips_cached_until_head_changes(self, mock_github, mock_settings):
+        """ブランチ先頭が変わるまで旅行一覧の走査結果を再利用する."""
+        sync = GitHubSync()
+
+        mock_repo = MagicMock()
+        mock_repo.get_branch.return_value.commit.sha = "sha-1"
+
+        mock_metadata_file = MagicMock()
+        mock_metadata_file.type = "file"
+        mock_metadata_file.name = "20250628-札幌-business_metadata.json"
+        mock_metadata_file.path = "trips/2025/06/20250628-札幌-business_metadata.json"
+        mock_metadata_file.decoded_content.decode.return_value = (
+            '{"checklist_id": "test-001", "user_id": "test-user", '
+            '"updated_at": "2025-06-27T11:00:00"}'
+        )
+        mock_repo.get_contents.return_value = [mock_metadata_file]
+        sync._repo = mock_repo
+
+        assert len(sync.get_user_trips("test-user")) == 1
+        assert sync.get_user_trips("other-user") == []
+        assert mock_repo.get_contents.call_count == 1
+
+        # 新しいコミットがあれば再走査する
+        mock_repo.get_branch.return_value.commit.sha = "sha-2"
+        assert len(sync.get_user_trips("test-user")) == 1
+        assert mock_repo.get_contents.call_count == 2
+
     def test_delete_checklist_success(self, mock_github, mock_settings):
         """チェックリスト削除の成功ケース."""
         sync = GitHubSync()
@@ -384,3 +412,12 @@ invalid yaml content
 
         with pytest.raises(GitHubSyncError):
             _ = sync.repo
+
+    def test_shared_github_sync_created_once(self, mock_github, mock_settings, monkeypatch):
+        """共有インスタンスは一度だけ作成される."""
+        monkeypatch.setattr(github_sync, "_shared_sync", None)
+
+        first = get_shared_github_sync()
+
+        assert get_shared_github_sync() is first
+        mock_github.assert_called_once_with("test-token")
@@ -213,6 +213,29 @@ def test_completed_and_total_count(sample_checklist: TripChecklist):
     assert sample_checklist.total_count == 5
 
 
+def test_completed_count_cached(sample_checklist: TripChecklist, monkeypatch):
+    """完了数は変更がなければ再集計しない."""
+    calls = []
+
+    def get_checked(item: ChecklistItem) -> bool:
+        calls.append(item)
+        return item.checked
+
+    monkeypatch.setattr("src.models._get_checked", get_checked)
+
+    assert sample_checklist.completed_count == 1
+    assert sample_checklist.completion_percentage == 20.0
+    assert len(calls) == 5  # 2回目は集計結果を再利用
+
+    # チェック状態の直接変更・項目の追加削除でキャッシュが無効になる
+    sample_checklist.items[1].checked = True
+    assert sample_checklist.completed_count == 2
+    sample_checklist.add_item(ChecklistItem(name="追加", category="生活用品", checked=True))
+    assert sample_checklist.completed_count == 3
+    sample_checklist.remove_item(sample_checklist.items[1].item_id)
+    assert sample_checklist.completed_count == 2
+
+
 def test_pending_items(sample_checklist: TripChecklist):
     """未完了アイテムのリスト."""
     pending = sample_checklist.pending_items
@@ -0,0 +1,270 @@
+"""
+Unit tests for schedule commands.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from src.bot import schedule_commands as schedule_module
+from src.bot.schedule_commands import (
+    _MSG_EDIT_TARGET_GONE,
+    FlightEditModal,
+    ScheduleCommands,
+    _parse_dt,
+    _split_airports,
+)
+from src.config.settings import settings
+from src.models import FlightInfo
+from src.utils import cache as cache_module
+
+
+@pytest.fixture
+def mock_bot():
+    """Mock Discord bot."""
+    return MagicMock(spec=discord.ext.commands.Bot)
+
+
+@pytest.fixture
+def cog(mock_bot, tmp_path, monkeypatch):
+    """ScheduleCommands with the user data directory redirected to tmp_path."""
+    monkeypatch.setattr(settings, "USER_DATA_PATH", str(tmp_path))
+    return ScheduleCommands(mock_bot, github_sync=MagicMock())
+
+
+@pytest.fixture
+def sample_flight():
+    """Sample flight for testing."""
+    return FlightInfo(
+        flight_number="JAL515",
+        airline="JAL",
+        departure_airport="HND",
+        arrival_airport="CTS",
+        scheduled_departure=datetime(2025, 7, 1, 8, 0),
+        scheduled_arrival=datetime(2025, 7, 1, 9, 35),
+    )
+
+
+class TestItineraryStore:
+    """Test itinerary caching on ScheduleCommands."""
+
+    @pytest.mark.asyncio
+    async def test_stored_itinerary_survives_restart(self, mock_bot, cog, sample_flight):
+        """Test that a stored itinerary is reloaded from disk on a cache miss."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+
+        new_cog = ScheduleCommands(mock_bot, github_sync=MagicMock())
+        loaded = await new_cog.get_itinerary("123")
+
+        assert loaded is not None
+        assert [flight.flight_number for flight in loaded.flights] == ["JAL515"]
+        assert await new_cog.get_itinerary("123") is loaded
+
+    @pytest.mark.asyncio
+    async def test_expired_itinerary_discarded(self, cog, sample_flight, monkeypatch):
+        """Test that an itinerary past the TTL is dropped from memory and disk."""
+        now = [1000.0]
+        # イベントループの時計は止めず、キャッシュの時計だけを差し替える
+        monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+        path = cog.itinerary_cache_dir / "123.json"
+        expired_at = datetime.now() - timedelta(seconds=settings.ITINERARY_CACHE_TTL + 1)
+        path.write_text(
+            itinerary.model_copy(update={"updated_at": expired_at}).model_dump_json(),
+            encoding="utf-8",
+        )
+
+        now[0] += settings.ITINERARY_CACHE_TTL
+        assert "123" not in cog.itineraries
+
+        assert await cog.get_itinerary("123") is None
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_recent_itinerary_reloaded_after_memory_expiry(
+        self, cog, sample_flight, monkeypatch
+    ):
+        """Test that an itinerary evicted from memory but still within the TTL is reloaded."""
+        now = [1000.0]
+        # イベントループの時計は止めず、キャッシュの時計だけを差し替える
+        monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+
+        now[0] += settings.ITINERARY_CACHE_TTL
+        loaded = await cog.get_itinerary("123")
+
+        assert loaded is not None
+        assert loaded is not itinerary
+        assert [flight.flight_number for flight in loaded.flights] == ["JAL515"]
+
+    @pytest.mark.asyncio
+    async def test_stale_files_purged_on_startup(self, mock_bot, cog, sample_flight):
+        """Test that itinerary files older than the TTL are deleted when the cog starts."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+        path = cog.itinerary_cache_dir / "123.json"
+        stale = time.time() - settings.ITINERARY_CACHE_TTL - 1
+        os.utime(path, (stale, stale))
+
+        ScheduleCommands(mock_bot, github_sync=MagicMock())
+
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_unsaved_itinerary_is_not_persisted(self, mock_bot, cog):
+        """Test that get_or_create_itinerary alone does not write to disk."""
+        await cog.get_or_create_itinerary("123")
+
+        new_cog = ScheduleCommands(mock_bot, github_sync=MagicMock())
+        assert await new_cog.get_itinerary("123") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_itinerary(self, cog, sample_flight):
+        """Test that clearing removes the itinerary from memory and disk."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+
+        assert await cog.clear_itinerary("123") is True
+        assert await cog.get_itinerary("123") is None
+        assert await cog.clear_itinerary("123") is False
+
+
+class TestScheduleHandlers:
+    """Test /schedule handlers and modals against the itinerary store."""
+
+    @pytest.fixture
+    def interaction(self):
+        """Mock interaction from user 123."""
+        interaction = AsyncMock()
+        interaction.user.id = 123
+        interaction.response = AsyncMock()
+        interaction.followup = AsyncMock()
+        return interaction
+
+    @pytest.mark.asyncio
+    async def test_save_persists_trip_id(self, mock_bot, cog, sample_flight, interaction):
+        """Test that the trip ID assigned on save survives a reload from disk."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+
+        await cog._handle_save_schedule(interaction)
+
+        cog.github_sync.save_itinerary.assert_called_once()
+        reloaded = await ScheduleCommands(mock_bot, github_sync=MagicMock()).get_itinerary("123")
+        assert reloaded is not None
+        assert reloaded.trip_id == "20250701-CTS"
+
+    @pytest.mark.asyncio
+    async def test_edit_after_clear_does_not_restore(self, cog, sample_flight, interaction):
+        """Test that submitting an edit for a cleared itinerary does not write it back."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+        modal = FlightEditModal(cog, sample_flight)
+
+        await cog.clear_itinerary("123")
+        await modal.on_submit(interaction)
+
+        interaction.response.send_message.assert_called_once_with(
+            _MSG_EDIT_TARGET_GONE, ephemeral=True
+        )
+        assert await cog.get_itinerary("123") is None
+
+
+class TestParseDt:
+    """Test YYYY-MM-DD HH:MM datetime parsing."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("2025-07-01 08:00", datetime(2025, 7, 1, 8, 0)),
+            (" 2025-7-1 8:05 ", datetime(2025, 7, 1, 8, 5)),
+        ],
+    )
+    def test_valid_datetime(self, value, expected):
+        """Test that well-formed datetimes are parsed."""
+        assert _parse_dt(value) == expected
+
+    @pytest.mark.parametrize(
+        "value", ["2025/07/01 08:00", "2025-07-01T08:00", "2025-07-01", "2025-02-30 08:00", ""]
+    )
+    def test_invalid_datetime(self, value):
+        """Test that malformed or nonexistent datetimes raise ValueError."""
+        with pytest.raises(ValueError):
+            _parse_dt(value)
+
+
+class TestSplitAirports:
+    """Test airport pair parsing."""
+
+    @pytest.mark.parametrize("value", ["HND → CTS", "HND->CTS", " HND -> CTS "])
+    def test_valid_pair(self, value):
+        """Test that both separators are accepted."""
+        assert _split_airports(value) == ("HND", "CTS")
+
+    @pytest.mark.parametrize("value", ["HND CTS", "HND → CTS → OKA", "HND->CTS→OKA", ""])
+    def test_invalid_pair(self, value):
+        """Test that a missing or repeated separator raises ValueError."""
+        with pytest.raises(ValueError):
+            _split_airports(value)
+
+
+class TestScheduleEmbed:
+    """Test schedule embed rendering."""
+
+    @pytest.mark.asyncio
+    async def test_embed_cached_until_itinerary_changes(self, cog, sample_flight):
+        """Test that the embed is reused until the itinerary is stored again or renamed."""
+        itinerary = await cog.get_or_create_itinerary("123")
+        itinerary.flights.append(sample_flight)
+        await cog.store_itinerary("123", itinerary)
+
+        first = cog._create_schedule_embed("123", itinerary)
+        assert cog._create_schedule_embed("123", itinerary) is first
+        assert [field.name for field in first.fields] == ["📋 タイムライン", "✈️ フライト"]
+
+        sample_flight.flight_number = "JAL517"
+        await cog.store_itinerary("123", itinerary)
+
+        updated = cog._create_schedule_embed("123", itinerary)
+        assert updated is not first
+        assert "JAL517" in updated.fields[1].value
+
+        itinerary.trip_id = "20250701-CTS"  # 保存時の旅行IDの付け替え
+        renamed = cog._create_schedule_embed("123", itinerary)
+        assert renamed is not updated
+        assert renamed.description == "旅行ID: 20250701-CTS"
+
+
+class TestRateLimit:
+    """Test per-user rate limiting of /schedule."""
+
+    def test_limits_calls_within_window(self, cog, monkeypatch):
+        """Test that calls beyond the limit are rejected until the window passes."""
+        now = [1000.0]
+        monkeypatch.setattr(schedule_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(settings, "SCHEDULE_RATE_LIMIT", 2)
+        monkeypatch.setattr(settings, "SCHEDULE_RATE_WINDOW", 60)
+
+        assert cog._check_rate_limit("123") is None
+        now[0] += 10
+        assert cog._check_rate_limit("123") is None
+        assert cog._check_rate_limit("123") == pytest.approx(50)
+        assert cog._check_rate_limit("456") is None  # 他のユーザーには影響しない
+
+        now[0] += 50
+        assert cog._check_rate_limit("123") is None
@@ -161,6 +161,16 @@ class TestTransportRulesLoader:
         recs = loader.get_recommendations("bus")
         assert len(recs) > 0
 
+    def test_recommendations_cached(self, loader: TransportRulesLoader) -> None:
+        """推奨事項のキャッシュテスト."""
+        first = loader.get_recommendations("car")
+        first.append("呼び出し側の変更")
+
+        # 2回目はキャッシュから返り、呼び出し側の変更は反映されない
+        second = loader.get_recommendations("car")
+        assert "car" in loader._recommendations_cache
+        assert "呼び出し側の変更" not in second
+
     def test_empty_transport_method(self, loader: TransportRulesLoader) -> None:
         """未知の交通手段のテスト."""
         items = loader.get_transport_items(